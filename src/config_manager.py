@@ -16,6 +16,8 @@ DEFAULT_CONFIG = {
         "timeout_ms": 30000,
         "max_retries": 3,
         "delay_between_requests_sec": 2,
+        "max_concurrency": 8,
+        "http_fast_path": True,
     },
     "paths": {
         "database_dir": "product_datas",
@@ -26,9 +28,19 @@ DEFAULT_CONFIG = {
     "analysis": {
         "auto_analyze_on_scrape": False,
         "save_reports": True
+    },
+    "storage": {
+        "pretty_json": False
     }
 }
 
+# Returned for marketplaces missing from supported_marketplaces; read-only
+DEFAULT_MARKETPLACE_CONFIG = {
+    "base_url": "https://www.amazon.com/dp/",
+    "currency": "USD",
+    "language": "en"
+}
+
 
 class ConfigManager:
     """Manage scraping configuration from config/scraping_config.json."""
@@ -55,12 +67,41 @@ class ConfigManager:
                     with open(config_path, 'r', encoding='utf-8') as f:
                         self._config = json.load(f)
                     logger.info(f"Loaded config from {config_path}")
+                    self._cache_values()
                     return
                 except Exception as e:
                     logger.warning(f"Failed to load config: {e}")
         
         logger.info("Using default configuration")
         self._config = DEFAULT_CONFIG.copy()
+        self._cache_values()
+    
+    def _cache_values(self):
+        """Resolve every setting once so property access is a plain attribute read."""
+        self._scraper = self._config.get("scraper", DEFAULT_CONFIG["scraper"])
+        self._paths = self._config.get("paths", DEFAULT_CONFIG["paths"])
+        self._analysis = self._config.get("analysis", DEFAULT_CONFIG["analysis"])
+        self._storage = self._config.get("storage", DEFAULT_CONFIG["storage"])
+        self._marketplaces = self._config.get("supported_marketplaces", {})
+        self._user_agents = self._config.get("user_agents", [
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+        ])
+        
+        self._base_url = self._scraper.get("base_url", "https://www.amazon.com/dp/")
+        self._marketplace = self._scraper.get("marketplace", "amazon_us")
+        self._headless = self._scraper.get("headless", True)
+        self._timeout = self._scraper.get("timeout_ms", 30000)
+        self._max_retries = self._scraper.get("max_retries", 3)
+        self._delay = self._scraper.get("delay_between_requests_sec", 2)
+        self._max_concurrency = self._scraper.get("max_concurrency", 8)
+        self._http_fast_path = self._scraper.get("http_fast_path", True)
+        
+        self._database_dir = self._paths.get("database_dir", "product_datas")
+        self._output_dir = self._paths.get("output_dir", "output")
+        
+        # Database files are read by code, not people; indenting them only
+        # costs encode time and disk. Reports stay indented regardless.
+        self._pretty_json = self._storage.get("pretty_json", False)
     
     def reload(self):
         """Reload configuration from file."""
@@ -68,62 +109,67 @@ class ConfigManager:
     
     @property
     def scraper(self) -> Dict[str, Any]:
-        return self._config.get("scraper", DEFAULT_CONFIG["scraper"])
+        return self._scraper
     
     @property
     def paths(self) -> Dict[str, Any]:
-        return self._config.get("paths", DEFAULT_CONFIG["paths"])
+        return self._paths
     
     @property
     def analysis(self) -> Dict[str, Any]:
-        return self._config.get("analysis", DEFAULT_CONFIG["analysis"])
+        return self._analysis
     
     @property
     def user_agents(self) -> list:
-        return self._config.get("user_agents", [
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        ])
+        return self._user_agents
     
     @property
     def base_url(self) -> str:
-        return self.scraper.get("base_url", "https://www.amazon.com/dp/")
+        return self._base_url
     
     @property
     def marketplace(self) -> str:
-        return self.scraper.get("marketplace", "amazon_us")
+        return self._marketplace
     
     @property
     def headless(self) -> bool:
-        return self.scraper.get("headless", True)
+        return self._headless
     
     @property
     def timeout(self) -> int:
-        return self.scraper.get("timeout_ms", 30000)
+        return self._timeout
     
     @property
     def max_retries(self) -> int:
-        return self.scraper.get("max_retries", 3)
+        return self._max_retries
     
     @property
     def delay(self) -> float:
-        return self.scraper.get("delay_between_requests_sec", 2)
+        return self._delay
+    
+    @property
+    def max_concurrency(self) -> int:
+        return self._max_concurrency
+    
+    @property
+    def http_fast_path(self) -> bool:
+        return self._http_fast_path
     
     @property
     def database_dir(self) -> str:
-        return self.paths.get("database_dir", "product_datas")
+        return self._database_dir
     
     @property
     def output_dir(self) -> str:
-        return self.paths.get("output_dir", "output")
+        return self._output_dir
+    
+    @property
+    def pretty_json(self) -> bool:
+        return self._pretty_json
     
     def get_marketplace_config(self, marketplace: str) -> Dict[str, Any]:
         """Get configuration for a specific marketplace."""
-        marketplaces = self._config.get("supported_marketplaces", {})
-        return marketplaces.get(marketplace, {
-            "base_url": "https://www.amazon.com/dp/",
-            "currency": "USD",
-            "language": "en"
-        })
+        return self._marketplaces.get(marketplace, DEFAULT_MARKETPLACE_CONFIG)
     
     def set_marketplace(self, marketplace: str):
         """Switch to a different marketplace."""
@@ -131,6 +177,7 @@ class ConfigManager:
         if mp_config:
             self._config["scraper"]["marketplace"] = marketplace
             self._config["scraper"]["base_url"] = mp_config["base_url"]
+            self._cache_values()
             logger.info(f"Switched to marketplace: {marketplace}")
 
 
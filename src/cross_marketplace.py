@@ -3,13 +3,20 @@ Cross-Marketplace Arbitrage Engine.
 Compares product prices across multiple Amazon marketplaces to find arbitrage opportunities.
 """
 from __future__ import annotations
-import json
 import logging
+import os
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 from datetime import datetime
 
+from . import json_utils
+from .data_importer import SUMMARY_FILENAME, build_price_summary
+
 logger = logging.getLogger(__name__)
 
 # Currency exchange rates to USD (approximate - should be updated from API in production)
@@ -44,8 +51,63 @@ MARKETPLACE_CURRENCIES = {
     "jp": "JPY",
 }
 
+# Marketplace code -> USD rate, resolved once at import
+MARKETPLACE_TO_RATE = {
+    mp: EXCHANGE_RATES.get(currency, 1.0)
+    for mp, currency in MARKETPLACE_CURRENCIES.items()
+}
+
+# Flag, currency and USD rate per marketplace in a single lookup
+_MP = namedtuple("_MP", "flag currency rate")
+_DEFAULT_MP = _MP("🌐", "USD", 1.0)
+MARKETPLACE_META = {
+    mp: _MP(MARKETPLACE_FLAGS[mp], currency, MARKETPLACE_TO_RATE[mp])
+    for mp, currency in MARKETPLACE_CURRENCIES.items()
+}
+
+# Fee estimate as a share of buy box when the data has no FBA total
+FBA_DEFAULT_MULT = 0.15
+
+# (minimum margin %, recommendation), checked in order
+RECOMMENDATION_LADDER = (
+    (20, "🟢 STRONG BUY - Excellent arbitrage opportunity"),
+    (10, "🟡 CONDITIONAL - Consider fees and shipping costs"),
+    (5, "🟠 MARGINAL - Low profit after fees"),
+)
+NOT_RECOMMENDED = "🔴 NOT RECOMMENDED - Insufficient margin"
+
+# Fixed report chrome for the display methods
+_HR_EQ = "=" * 60
+_HR_DASH = "-" * 39
+_HR_HEADER = f"{'Marketplace':<12} {'Local Price':<15} {'USD Equiv.':<12}"
+
+
+def _classify_margin(buy_usd: float, sell_usd: float) -> tuple[float, float, str]:
+    """Return (gross_profit, margin_pct, recommendation) for a buy/sell pair."""
+    gross_profit = sell_usd - buy_usd
+    margin_pct = (gross_profit / buy_usd) * 100 if buy_usd > 0 else 0
+    for threshold, recommendation in RECOMMENDATION_LADDER:
+        if margin_pct >= threshold:
+            return gross_profit, margin_pct, recommendation
+    return gross_profit, margin_pct, NOT_RECOMMENDED
 
-@dataclass
+
+def _price_extremes(prices: List[MarketplacePrice]) -> tuple[MarketplacePrice, MarketplacePrice]:
+    """
+    Return (cheapest, most expensive) in one pass. Ties resolve like a
+    stable sort: first cheapest, last most expensive.
+    """
+    best_buy = best_sell = prices[0]
+    lo = hi = best_buy.usd_price
+    for p in prices:
+        if p.usd_price < lo:
+            lo, best_buy = p.usd_price, p
+        if p.usd_price >= hi:
+            hi, best_sell = p.usd_price, p
+    return best_buy, best_sell
+
+
+@dataclass(slots=True, frozen=True)
 class MarketplacePrice:
     """Price data for a single marketplace."""
     marketplace: str
@@ -57,7 +119,7 @@ class MarketplacePrice:
     available: bool = True
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ArbitrageOpportunity:
     """Cross-marketplace arbitrage opportunity."""
     asin: str
@@ -83,48 +145,113 @@ class CrossMarketplaceEngine:
     
     def __init__(self, db_dir: str = "product_datas"):
         self.db_dir = Path(db_dir)
+        
+        # Each ASIN is looked up several times per report (prices, title),
+        # so keep parsed files and directory scans in memory for the
+        # lifetime of the engine. Call clear_cache() after writing new data.
+        self._marketplaces_cache: Dict[str, List[str]] = {}
+        self._marketplaces_mtime: Optional[int] = None
+        self._load_cached = lru_cache(maxsize=4096)(self._read_latest)
+        self._summary_cached = lru_cache(maxsize=4096)(self._read_summary)
+    
+    def clear_cache(self):
+        """Drop cached marketplace listings and product data."""
+        self._marketplaces_cache.clear()
+        self._marketplaces_mtime = None
+        self._load_cached.cache_clear()
+        self._summary_cached.cache_clear()
     
     def get_available_marketplaces(self, asin: str) -> List[str]:
-        """Get list of marketplaces where this ASIN has data."""
-        marketplaces = []
-        for mp_dir in self.db_dir.iterdir():
-            if mp_dir.is_dir() and (mp_dir / asin / "latest.json").exists():
-                marketplaces.append(mp_dir.name)
-        return sorted(marketplaces)
+        """
+        Get list of marketplaces where this ASIN has data.
+        
+        Found listings are cached until a marketplace directory is added or
+        removed (db_dir's mtime). Saving the ASIN under another existing
+        marketplace does not touch db_dir, so call clear_cache() after such
+        writes; ASINs found nowhere are never cached and always rescanned.
+        """
+        try:
+            mtime = self.db_dir.stat().st_mtime_ns
+        except OSError:
+            return []
+        
+        if mtime != self._marketplaces_mtime:
+            self._marketplaces_cache.clear()
+            self._marketplaces_mtime = mtime
+        
+        cached = self._marketplaces_cache.get(asin)
+        if cached is not None:
+            return list(cached)
+        
+        # DirEntry.is_dir() uses the cached dirent type, so the only stat per
+        # marketplace is the latest.json probe
+        with os.scandir(self.db_dir) as it:
+            marketplaces = sorted(
+                e.name for e in it
+                if e.is_dir(follow_symlinks=False)
+                and os.path.isfile(os.path.join(e.path, asin, "latest.json"))
+            )
+        if marketplaces:
+            self._marketplaces_cache[asin] = marketplaces
+        return list(marketplaces)
     
     def load_marketplace_data(self, asin: str, marketplace: str) -> Optional[Dict[str, Any]]:
-        """Load product data for a specific marketplace."""
+        """
+        Load product data for a specific marketplace.
+        
+        Results are cached per engine; treat the returned dict as read-only.
+        """
+        return self._load_cached(asin, marketplace)
+    
+    def _read_latest(self, asin: str, marketplace: str) -> Optional[Dict[str, Any]]:
         filepath = self.db_dir / marketplace / asin / "latest.json"
         if not filepath.exists():
             return None
         
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return json_utils.read_json(filepath)
         except Exception as e:
             logger.error(f"Failed to load {filepath}: {e}")
             return None
     
+    def load_price_summary(self, asin: str, marketplace: str) -> Optional[Dict[str, Any]]:
+        """
+        Load the price fields for a marketplace, preferring the compact
+        summary written by DataImporter and falling back to latest.json.
+        """
+        return self._summary_cached(asin, marketplace)
+    
+    def _read_summary(self, asin: str, marketplace: str) -> Optional[Dict[str, Any]]:
+        filepath = self.db_dir / marketplace / asin / SUMMARY_FILENAME
+        try:
+            return json_utils.read_json(filepath)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable {filepath}: {e}")
+        
+        data = self.load_marketplace_data(asin, marketplace)
+        return build_price_summary(data) if data else None
+    
     def get_all_marketplace_prices(self, asin: str) -> List[MarketplacePrice]:
         """Get prices for an ASIN across all available marketplaces."""
         prices = []
         
         for marketplace in self.get_available_marketplaces(asin):
-            data = self.load_marketplace_data(asin, marketplace)
-            if not data:
+            pricing = self.load_price_summary(asin, marketplace)
+            if not pricing:
                 continue
             
-            pricing = data.get("pricing_mechanics", {})
-            buy_box = pricing.get("buy_box_price", 0)
+            # Stored documents carry explicit nulls, so a .get default is not enough
+            buy_box = pricing.get("buy_box_price") or 0
             
             if buy_box <= 0:
                 continue
             
-            currency = MARKETPLACE_CURRENCIES.get(marketplace, "USD")
-            rate = EXCHANGE_RATES.get(currency, 1.0)
+            _, currency, rate = MARKETPLACE_META.get(marketplace, _DEFAULT_MP)
             usd_price = buy_box * rate
             
-            fba_fee = pricing.get("fba_total_fee", 0) or (buy_box * 0.15)
+            fba_fee = pricing.get("fba_total_fee", 0) or (buy_box * FBA_DEFAULT_MULT)
             
             prices.append(MarketplacePrice(
                 marketplace=marketplace,
@@ -136,7 +263,7 @@ class CrossMarketplaceEngine:
                 available=True
             ))
         
-        return sorted(prices, key=lambda x: x.usd_price)
+        return prices
     
     def find_arbitrage(self, asin: str) -> Optional[ArbitrageOpportunity]:
         """Find the best arbitrage opportunity for an ASIN."""
@@ -147,31 +274,21 @@ class CrossMarketplaceEngine:
             return None
         
         # Best = lowest USD price (buy), Worst = highest USD price (sell)
-        best_buy = prices[0]
-        best_sell = prices[-1]
+        best_buy, best_sell = _price_extremes(prices)
         
         if best_buy.marketplace == best_sell.marketplace:
             return None
         
-        gross_profit = best_sell.usd_price - best_buy.usd_price
-        margin_pct = (gross_profit / best_buy.usd_price) * 100 if best_buy.usd_price > 0 else 0
-        
-        # Generate recommendation
-        if margin_pct >= 20:
-            recommendation = "🟢 STRONG BUY - Excellent arbitrage opportunity"
-        elif margin_pct >= 10:
-            recommendation = "🟡 CONDITIONAL - Consider fees and shipping costs"
-        elif margin_pct >= 5:
-            recommendation = "🟠 MARGINAL - Low profit after fees"
-        else:
-            recommendation = "🔴 NOT RECOMMENDED - Insufficient margin"
+        gross_profit, margin_pct, recommendation = _classify_margin(
+            best_buy.usd_price, best_sell.usd_price
+        )
         
         # Get title from any available data
         title = "Unknown Product"
         for mp in [best_buy.marketplace, best_sell.marketplace]:
-            data = self.load_marketplace_data(asin, mp)
-            if data and data.get("identification", {}).get("title"):
-                title = data["identification"]["title"]
+            summary = self.load_price_summary(asin, mp)
+            if summary and summary.get("title"):
+                title = summary["title"]
                 break
         
         return ArbitrageOpportunity(
@@ -190,14 +307,36 @@ class CrossMarketplaceEngine:
             recommendation=recommendation
         )
     
+    def find_arbitrage_batch(
+        self,
+        asins: List[str],
+        max_workers: int = 16
+    ) -> Dict[str, Optional[ArbitrageOpportunity]]:
+        """
+        Find arbitrage opportunities for many ASINs.
+        
+        The cost of a catalog sweep is reading files, not the per-ASIN
+        arithmetic, so every (asin, marketplace) price summary is loaded into
+        the cache on a thread pool first; the scoring pass then runs from memory.
+        """
+        pairs = [
+            (asin, mp)
+            for asin in asins
+            for mp in self.get_available_marketplaces(asin)
+        ]
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            list(pool.map(lambda pair: self.load_price_summary(*pair), pairs))
+        
+        return {asin: self.find_arbitrage(asin) for asin in asins}
+    
     def display_arbitrage(self, opp: ArbitrageOpportunity):
         """Display arbitrage opportunity in a formatted way."""
-        buy_flag = MARKETPLACE_FLAGS.get(opp.buy_marketplace, "🌐")
-        sell_flag = MARKETPLACE_FLAGS.get(opp.sell_marketplace, "🌐")
+        buy_flag = MARKETPLACE_META.get(opp.buy_marketplace, _DEFAULT_MP).flag
+        sell_flag = MARKETPLACE_META.get(opp.sell_marketplace, _DEFAULT_MP).flag
         
-        print(f"\n{'='*60}")
+        print(f"\n{_HR_EQ}")
         print(f"🌍 CROSS-MARKETPLACE ARBITRAGE: {opp.asin}")
-        print(f"{'='*60}")
+        print(_HR_EQ)
         print(f"📦 {opp.title}")
         print()
         print(f"  💰 BUY FROM:  {buy_flag} {opp.buy_marketplace.upper()}")
@@ -209,25 +348,25 @@ class CrossMarketplaceEngine:
         print(f"  📊 PROFIT:    ${opp.gross_profit_usd:.2f} ({opp.profit_margin_pct:.1f}% margin)")
         print()
         print(f"  {opp.recommendation}")
-        print(f"{'='*60}\n")
+        print(f"{_HR_EQ}\n")
     
     def display_all_prices(self, asin: str):
         """Display prices across all marketplaces."""
-        prices = self.get_all_marketplace_prices(asin)
+        prices = sorted(self.get_all_marketplace_prices(asin), key=attrgetter("usd_price"))
         
         if not prices:
             print(f"No marketplace data found for {asin}")
             return
         
-        print(f"\n{'='*60}")
+        print(f"\n{_HR_EQ}")
         print(f"🌍 MARKETPLACE PRICES: {asin}")
-        print(f"{'='*60}")
-        print(f"{'Marketplace':<12} {'Local Price':<15} {'USD Equiv.':<12}")
-        print("-" * 39)
+        print(_HR_EQ)
+        print(_HR_HEADER)
+        print(_HR_DASH)
         
         for p in prices:
-            flag = MARKETPLACE_FLAGS.get(p.marketplace, "🌐")
+            flag = MARKETPLACE_META.get(p.marketplace, _DEFAULT_MP).flag
             marker = " ← LOWEST" if p == prices[0] else ""
             print(f"{flag} {p.marketplace.upper():<9} {p.currency} {p.local_price:<10.2f} ${p.usd_price:<8.2f}{marker}")
         
-        print(f"{'='*60}\n")
+        print(f"{_HR_EQ}\n")
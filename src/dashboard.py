@@ -3,7 +3,6 @@ Rich Terminal Dashboard for Autonomous Merchant Engine.
 Displays analysis results in a visually appealing format.
 """
 from __future__ import annotations
-import json
 from typing import Optional
 from rich.console import Console
 from rich.table import Table
@@ -18,16 +17,82 @@ from .analysis_models import (
     VelocityGrade,
     Verdict,
 )
+from . import json_utils
+
+VELOCITY_STYLES = {
+    VelocityGrade.SPRINTER: ("cyan", "⚡ SPRINTER"),
+    VelocityGrade.STEADY: ("yellow", "🏃 STEADY"),
+    VelocityGrade.SLOW: ("red", "🐢 SLOW"),
+}
+
+BUYBOX_RISK_STYLES = {
+    RiskLevel.LOW: ("green", "🟢 LOW"),
+    RiskLevel.MEDIUM: ("yellow", "🟡 MEDIUM"),
+    RiskLevel.HIGH: ("red", "🔴 HIGH"),
+    RiskLevel.CRITICAL: ("red bold", "🚨 CRITICAL"),
+}
+
+IP_RISK_STYLES = {
+    RiskLevel.LOW: ("green", "🟢 LOW"),
+    RiskLevel.MEDIUM: ("yellow", "🟡 MEDIUM"),
+    RiskLevel.HIGH: ("red", "🔴 HIGH - AVOID"),
+}
+
+RETURN_RISK_STYLES = {
+    RiskLevel.LOW: ("green", "🟢 LOW"),
+    RiskLevel.MEDIUM: ("yellow", "🟡 MEDIUM"),
+    RiskLevel.HIGH: ("red", "🔴 HIGH"),
+}
+
+VERDICT_STYLES = {
+    Verdict.GO: ("green", "✅ GO"),
+    Verdict.NO_GO: ("red", "❌ NO-GO"),
+    Verdict.CONDITIONAL: ("yellow", "⚠️ CONDITIONAL"),
+}
+
+VERDICT_ICONS = {Verdict.GO: "✅", Verdict.NO_GO: "❌", Verdict.CONDITIONAL: "⚠️"}
+
+# Pre-rendered 0-100 bars for the widths the report sections use
+PROGRESS_BARS = {
+    width: tuple(
+        f"[{'█' * int(v / 100 * width)}{'░' * (width - int(v / 100 * width))}]"
+        for v in range(101)
+    )
+    for width in (15, 20)
+}
+
+_DEFAULT_CONSOLE: Optional[Console] = None
+
+
+def _get_console() -> Console:
+    """Shared Console, so terminal detection runs once per process."""
+    global _DEFAULT_CONSOLE
+    if _DEFAULT_CONSOLE is None:
+        _DEFAULT_CONSOLE = Console()
+    return _DEFAULT_CONSOLE
 
 
 class MerchantDashboard:
     """Terminal dashboard for displaying analysis reports."""
     
-    def __init__(self):
-        self.console = Console()
+    def __init__(self, batch_mode: Optional[bool] = None, console: Optional[Console] = None):
+        self.console = console or _get_console()
+        # Piped output (logs, batch runs) gets one write per report instead of
+        # one per section; defaults to on when stdout is not a terminal
+        self.batch_mode = batch_mode if batch_mode is not None else not self.console.is_terminal
     
     def display(self, report: MerchantAnalysisReport) -> None:
         """Display the complete analysis report in terminal."""
+        if not self.batch_mode:
+            self._print_report(report)
+            return
+        
+        with self.console.capture() as capture:
+            self._print_report(report)
+        self.console.file.write(capture.get())
+        self.console.file.flush()
+    
+    def _print_report(self, report: MerchantAnalysisReport) -> None:
         self.console.print()
         self._print_header(report)
         self._print_arbitrage_section(report)
@@ -86,21 +151,10 @@ class MerchantDashboard:
         table.add_row("ROI", f"[{roi_color}]{arb.roi_percentage:.1f}%[/{roi_color}]", "")
         table.add_row("Margin", f"{arb.margin_percentage:.1f}%", "")
         
-        velocity_styles = {
-            VelocityGrade.SPRINTER: ("cyan", "⚡ SPRINTER"),
-            VelocityGrade.STEADY: ("yellow", "🏃 STEADY"),
-            VelocityGrade.SLOW: ("red", "🐢 SLOW"),
-        }
-        vel_color, vel_text = velocity_styles.get(arb.velocity_grade, ("white", "Unknown"))
+        vel_color, vel_text = VELOCITY_STYLES.get(arb.velocity_grade, ("white", "Unknown"))
         table.add_row("Velocity", f"[{vel_color}]{vel_text}[/{vel_color}]", "")
         
-        risk_styles = {
-            RiskLevel.LOW: ("green", "🟢 LOW"),
-            RiskLevel.MEDIUM: ("yellow", "🟡 MEDIUM"),
-            RiskLevel.HIGH: ("red", "🔴 HIGH"),
-            RiskLevel.CRITICAL: ("red bold", "🚨 CRITICAL"),
-        }
-        risk_color, risk_text = risk_styles.get(arb.buybox_risk_level, ("white", "Unknown"))
+        risk_color, risk_text = BUYBOX_RISK_STYLES.get(arb.buybox_risk_level, ("white", "Unknown"))
         table.add_row("BuyBox Risk", f"[{risk_color}]{risk_text}[/{risk_color}]", "")
         
         if arb.amazon_is_seller:
@@ -157,12 +211,7 @@ class MerchantDashboard:
         table.add_column("Factor", style="dim", width=20)
         table.add_column("Status", justify="right", width=25)
         
-        ip_styles = {
-            RiskLevel.LOW: ("green", "🟢 LOW"),
-            RiskLevel.MEDIUM: ("yellow", "🟡 MEDIUM"),
-            RiskLevel.HIGH: ("red", "🔴 HIGH - AVOID"),
-        }
-        ip_color, ip_text = ip_styles.get(risk.ip_risk_level, ("white", "Unknown"))
+        ip_color, ip_text = IP_RISK_STYLES.get(risk.ip_risk_level, ("white", "Unknown"))
         table.add_row("IP Infringement Risk", f"[{ip_color}]{ip_text}[/{ip_color}]")
         
         stability_color = "green" if risk.price_stability_score >= 0.8 else "yellow" if risk.price_stability_score >= 0.5 else "red"
@@ -172,12 +221,7 @@ class MerchantDashboard:
         war_text = "[red]🔥 YES - ACTIVE[/red]" if risk.price_war_detected else "[green]✅ NO[/green]"
         table.add_row("Price War", war_text)
         
-        return_styles = {
-            RiskLevel.LOW: ("green", "🟢 LOW"),
-            RiskLevel.MEDIUM: ("yellow", "🟡 MEDIUM"),
-            RiskLevel.HIGH: ("red", "🔴 HIGH"),
-        }
-        ret_color, ret_text = return_styles.get(risk.return_rate_risk, ("white", "Unknown"))
+        ret_color, ret_text = RETURN_RISK_STYLES.get(risk.return_rate_risk, ("white", "Unknown"))
         table.add_row("Return Rate Risk", f"[{ret_color}]{ret_text}[/{ret_color}]")
         
         table.add_row("Seasonal Factor", risk.seasonal_risk)
@@ -200,24 +244,18 @@ class MerchantDashboard:
         table.add_column("Verdict", justify="center", width=12)
         table.add_column("Reason", width=40)
         
-        verdict_styles = {
-            Verdict.GO: ("green", "✅ GO"),
-            Verdict.NO_GO: ("red", "❌ NO-GO"),
-            Verdict.CONDITIONAL: ("yellow", "⚠️ CONDITIONAL"),
-        }
-        
-        arb_color, arb_icon = verdict_styles.get(v.arbitrage_verdict, ("white", "?"))
+        arb_color, arb_icon = VERDICT_STYLES.get(v.arbitrage_verdict, ("white", "?"))
         table.add_row("Arbitrage/RA", f"[{arb_color}]{arb_icon}[/{arb_color}]", v.arbitrage_reason)
         
-        drop_color, drop_icon = verdict_styles.get(v.dropshipping_verdict, ("white", "?"))
+        drop_color, drop_icon = VERDICT_STYLES.get(v.dropshipping_verdict, ("white", "?"))
         table.add_row("Dropshipping", f"[{drop_color}]{drop_icon}[/{drop_color}]", v.dropshipping_reason)
         
-        pl_color, pl_icon = verdict_styles.get(v.private_label_verdict, ("white", "?"))
+        pl_color, pl_icon = VERDICT_STYLES.get(v.private_label_verdict, ("white", "?"))
         table.add_row("Private Label", f"[{pl_color}]{pl_icon}[/{pl_color}]", v.private_label_reason)
         
         self.console.print(table)
         
-        overall_color, overall_icon = verdict_styles.get(v.overall_verdict, ("white", "?"))
+        overall_color, overall_icon = VERDICT_STYLES.get(v.overall_verdict, ("white", "?"))
         summary_style = "bold " + overall_color
         
         summary_panel = Panel(
@@ -230,25 +268,31 @@ class MerchantDashboard:
     
     def _make_progress_bar(self, value: int, max_val: int, width: int = 20) -> str:
         """Create a simple progress bar string."""
+        bars = PROGRESS_BARS.get(width)
+        if bars is not None and max_val == 100 and 0 <= value <= 100 and value == int(value):
+            return bars[int(value)]
+        
         filled = int((value / max_val) * width)
         empty = width - filled
         return f"[{'█' * filled}{'░' * empty}]"
     
     def export_json(self, report: MerchantAnalysisReport, filepath: str) -> None:
         """Export the report to a JSON file."""
-        with open(filepath, 'w') as f:
-            json.dump(report.model_dump(mode='json'), f, indent=2)
+        json_utils.write_bytes(filepath, report.model_dump_json(indent=2).encode('utf-8'))
         self.console.print(f"[green]✓ Report exported to {filepath}[/green]")
     
-    def print_summary_line(self, report: MerchantAnalysisReport) -> None:
-        """Print a single-line summary for batch processing."""
+    def _summary_text(self, report: MerchantAnalysisReport) -> Text:
+        """Build the summary line as styled Text, so no markup is parsed."""
         v = report.verdict
-        verdict_icons = {Verdict.GO: "✅", Verdict.NO_GO: "❌", Verdict.CONDITIONAL: "⚠️"}
-        icon = verdict_icons.get(v.overall_verdict, "?")
-        
-        self.console.print(
-            f"{icon} [cyan]{report.asin}[/cyan] | "
-            f"Profit: ${report.arbitrage_analysis.net_profit:.2f} | "
+        text = Text(f"{VERDICT_ICONS.get(v.overall_verdict, '?')} ")
+        text.append(report.asin, style="cyan")
+        text.append(
+            f" | Profit: ${report.arbitrage_analysis.net_profit:.2f} | "
             f"PL: {report.private_label_analysis.pl_score}/100 | "
             f"{v.summary[:50]}..."
         )
+        return text
+    
+    def print_summary_line(self, report: MerchantAnalysisReport) -> None:
+        """Print a single-line summary for batch processing."""
+        self.console.print(self._summary_text(report), highlight=False)
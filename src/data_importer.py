@@ -4,18 +4,178 @@ Database structure: product_datas/{marketplace}/{ASIN}/latest.json
 """
 from __future__ import annotations
 import asyncio
-import json
+import contextlib
 import logging
+import os
+import time
+from collections import OrderedDict
 from pathlib import Path
-from datetime import datetime
-from typing import List, Optional, Dict, Any
+from datetime import datetime, timezone
+from types import MappingProxyType
+from typing import Iterator, List, Optional, Dict, Any, Set, Union
+from pydantic import BaseModel
 
 from .enhanced_models import EnhancedMasterProduct
-from .models import MasterProduct
 from .config_manager import config
+from . import json_utils
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on raw files read concurrently during a bulk import
+IMPORT_CONCURRENCY = 64
+
+# Lock stripes serializing concurrent saves of the same ASIN
+SAVE_LOCK_STRIPES = 64
+
+# Shared read-only default for missing sections, instead of a fresh {} per lookup
+_EMPTY = MappingProxyType({})
+
+# Compact per-ASIN file with the only fields the cross-marketplace scan reads
+SUMMARY_FILENAME = "_summary.json"
+
+# Validated products kept in memory by DataImporter.get_product
+PRODUCT_CACHE_SIZE = 1024
+
+# posix_fadvise is missing on Windows and macOS
+HAS_FADVISE = hasattr(os, 'posix_fadvise')
+
+
+# (YYYY-MM-DD, epoch second at which it stops being today) in UTC
+_today_utc = ("", 0.0)
+
+
+def _utc_today() -> str:
+    """Current UTC date string, formatted once per day rather than per save."""
+    global _today_utc
+    now = time.time()
+    value, valid_until = _today_utc
+    if now >= valid_until:
+        value = time.strftime("%Y-%m-%d", time.gmtime(now))
+        _today_utc = (value, (now // 86400 + 1) * 86400)
+    return value
+
+
+def build_price_summary(product_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract the price-comparison fields from a serialized product."""
+    pricing = product_dict.get("pricing_mechanics") or _EMPTY
+    identification = product_dict.get("identification") or _EMPTY
+    return {
+        "buy_box_price": pricing.get("buy_box_price"),
+        "fba_total_fee": pricing.get("fba_total_fee"),
+        "currency": pricing.get("currency"),
+        "title": identification.get("title"),
+    }
+
+
+def _model_price_summary(product: EnhancedMasterProduct) -> Dict[str, Any]:
+    """build_price_summary for a model, read off attributes instead of a dump."""
+    pricing = product.pricing_mechanics
+    return {
+        "buy_box_price": pricing.buy_box_price if pricing else None,
+        "fba_total_fee": pricing.fba_total_fee if pricing else None,
+        "currency": pricing.currency if pricing else None,
+        "title": product.identification.title,
+    }
+
+
+def _copy_file_range(src: Union[str, Path], dst: Union[str, Path]):
+    """Copy src to dst inside the kernel (a reflink on XFS/Btrfs)."""
+    fd_src = os.open(src, os.O_RDONLY)
+    try:
+        fd_dst = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            remaining = os.fstat(fd_src).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(fd_src, fd_dst, remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        finally:
+            os.close(fd_dst)
+    finally:
+        os.close(fd_src)
+
+
+def _read_once(filepath: Union[str, Path]) -> bytes:
+    """
+    Read a file that will not be read again, then tell the kernel to drop
+    its pages so bulk imports do not evict the hot database files from the
+    page cache.
+    """
+    with open(filepath, 'rb') as f:
+        data = f.read()
+        if HAS_FADVISE:
+            try:
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+            except OSError:
+                pass
+    return data
+
+
+def _load_raw_data(filepath: Path, mp: str, scraped_at: str) -> Optional[Dict[str, Any]]:
+    """Read a raw scrape file and stamp its meta; None when it carries no ASIN."""
+    data = json_utils.loads(_read_once(filepath))
+    
+    if 'asin' not in (data.get('identification') or _EMPTY):
+        return None
+    
+    # Add marketplace to meta if missing
+    if 'meta' not in data:
+        data['meta'] = {}
+    data['meta']['marketplace_code'] = mp
+    data['meta']['schema_version'] = '2.0.0'
+    data['meta']['scraped_at'] = scraped_at
+    data['meta']['source'] = f'amazon_{mp}'
+    return data
+
+
+def _load_raw_product(filepath: Path, mp: str, scraped_at: str) -> Optional[EnhancedMasterProduct]:
+    """Read and validate a raw scrape file; None when it carries no ASIN."""
+    data = _load_raw_data(filepath, mp, scraped_at)
+    return EnhancedMasterProduct.model_validate(data) if data is not None else None
+
+
+def _iter_subdirs(path: Union[str, Path]) -> Iterator[str]:
+    """Yield subdirectory names; the dirent type spares a stat per entry."""
+    try:
+        it = os.scandir(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return
+    with it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield entry.name
+
+
+def _scan_marketplace_dir(mp_dir: str) -> tuple[int, int, int]:
+    """
+    Return (products, snapshots, bytes) for one marketplace directory.
+    
+    A single os.scandir walk: DirEntry answers is_dir() from the dirent
+    type, so the only per-file syscall is the size stat, and no Path
+    objects are built per file.
+    """
+    products = snapshots = size = 0
+    try:
+        asin_entries = os.scandir(mp_dir)
+    except (FileNotFoundError, NotADirectoryError):
+        return 0, 0, 0
+    
+    with asin_entries:
+        for asin_entry in asin_entries:
+            if not asin_entry.is_dir():
+                continue
+            products += 1
+            with os.scandir(asin_entry.path) as files:
+                for f in files:
+                    name = f.name
+                    if not name.endswith(".json"):
+                        continue
+                    size += f.stat().st_size
+                    if name != "latest.json" and name != SUMMARY_FILENAME:
+                        snapshots += 1
+    return products, snapshots, size
+
 
 class DataImporter:
     """
@@ -48,7 +208,15 @@ class DataImporter:
         self.db_dir.mkdir(parents=True, exist_ok=True)
         (self.output_dir / "reports").mkdir(parents=True, exist_ok=True)
         
-        self.lock = asyncio.Lock()
+        # Saves to different ASINs touch disjoint files, so they only need
+        # to exclude each other per ASIN; striping keeps the lock count fixed
+        self._save_locks = [asyncio.Lock() for _ in range(SAVE_LOCK_STRIPES)]
+        
+        # (marketplace, asin) -> (latest.json mtime, validated product); a
+        # rewritten file gets a new mtime, so stale entries are never hit
+        self._product_cache: OrderedDict[tuple, tuple] = OrderedDict()
+        self._asin_dirs: Dict[tuple, str] = {}
+        self._ensured_dirs: Set[str] = set()
         logger.info(f"DataImporter initialized: marketplace={self.marketplace}, db={self.db_dir}")
     
     def _get_marketplace_code(self) -> str:
@@ -59,36 +227,58 @@ class DataImporter:
             return mp.replace("amazon_", "")
         return mp
     
-    def _get_asin_dir(self, asin: str, marketplace: str = None) -> Path:
+    def _asin_dir_str(self, asin: str, mp: str) -> str:
+        """ASIN directory as a str, joined once per (marketplace, asin)."""
+        key = (mp, asin)
+        asin_dir = self._asin_dirs.get(key)
+        if asin_dir is None:
+            asin_dir = self._asin_dirs[key] = os.path.join(self.db_dir, mp, asin)
+        return asin_dir
+    
+    def _get_asin_dir(self, asin: str, marketplace: str = None) -> str:
         """Get or create ASIN directory for a marketplace."""
-        mp = marketplace or self.marketplace
-        asin_dir = self.db_dir / mp / asin
-        asin_dir.mkdir(parents=True, exist_ok=True)
+        asin_dir = self._asin_dir_str(asin, marketplace or self.marketplace)
+        self._ensure_dir(asin_dir)
         return asin_dir
     
-    async def import_raw_file(self, filepath: Path, marketplace: str = None) -> Optional[str]:
-        """Import a single raw JSON file into the database."""
+    def _ensure_dir(self, path: str):
+        # makedirs costs a stat (and maybe a mkdir) per call; directories are
+        # never removed by the importer, so each only needs it once
+        if path not in self._ensured_dirs:
+            os.makedirs(path, exist_ok=True)
+            self._ensured_dirs.add(path)
+    
+    async def import_raw_file(
+        self,
+        filepath: Path,
+        marketplace: str = None,
+        scraped_at: str = None,
+        validate: bool = True
+    ) -> Optional[str]:
+        """
+        Import a single raw JSON file into the database.
+        
+        With validate=False the decoded document is stored as-is (plus meta)
+        without a pydantic round-trip; use it for trusted scraper output.
+        """
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            mp = marketplace or self.marketplace
+            scraped_at = scraped_at or datetime.now(timezone.utc).isoformat()
             
-            if 'identification' not in data or 'asin' not in data.get('identification', {}):
+            # Reading, decoding and validating are all synchronous; run them
+            # together on a worker thread so the event loop stays free
+            loader = _load_raw_product if validate else _load_raw_data
+            loaded = await asyncio.to_thread(loader, filepath, mp, scraped_at)
+            if loaded is None:
                 logger.warning(f"No ASIN found in {filepath.name}")
                 return None
             
-            asin = data['identification']['asin']
-            mp = marketplace or self.marketplace
-            
-            # Add marketplace to meta if missing
-            if 'meta' not in data:
-                data['meta'] = {}
-            data['meta']['marketplace_code'] = mp
-            data['meta']['schema_version'] = '2.0.0'
-            data['meta']['scraped_at'] = datetime.utcnow().isoformat()
-            data['meta']['source'] = f'amazon_{mp}'
-            
-            product = EnhancedMasterProduct(**data)
-            await self.save_product(product, marketplace=mp)
+            if validate:
+                asin = loaded.identification.asin
+                await self.save_product(loaded, marketplace=mp)
+            else:
+                asin = loaded['identification']['asin']
+                await self.save_product_dict(loaded, marketplace=mp)
             logger.info(f"Imported {asin} to {mp}/ from {filepath.name}")
             return asin
             
@@ -96,17 +286,31 @@ class DataImporter:
             logger.error(f"Failed to import {filepath}: {e}")
             return None
     
-    async def import_all_raw(self, marketplace: str = None) -> List[str]:
+    async def import_all_raw(self, marketplace: str = None, validate: bool = True) -> List[str]:
         """Import all JSON files from dumb_datas."""
         if not self.raw_dir.exists():
             logger.warning(f"Raw directory not found: {self.raw_dir}")
             return []
         
+        sem = asyncio.Semaphore(IMPORT_CONCURRENCY)
+        # One import batch shares one timestamp
+        scraped_at = datetime.now(timezone.utc).isoformat()
+        
+        async def _bound(filepath: Path) -> Optional[str]:
+            async with sem:
+                return await self.import_raw_file(filepath, marketplace, scraped_at, validate)
+        
+        # One bad file must not cancel the rest of the batch
+        results = await asyncio.gather(
+            *[_bound(p) for p in self.raw_dir.glob("*.json")],
+            return_exceptions=True
+        )
         imported = []
-        for filepath in self.raw_dir.glob("*.json"):
-            asin = await self.import_raw_file(filepath, marketplace)
-            if asin:
-                imported.append(asin)
+        for result in results:
+            if isinstance(result, BaseException):
+                logger.error(f"Raw import task failed: {result}")
+            elif result:
+                imported.append(result)
         
         mp = marketplace or self.marketplace
         logger.info(f"Imported {len(imported)} products to {mp}/")
@@ -116,84 +320,326 @@ class DataImporter:
         self, 
         product: EnhancedMasterProduct,
         marketplace: str = None,
-        create_snapshot: bool = True
+        create_snapshot: bool = True,
+        pretty: bool = None
     ) -> Path:
-        """Save product to marketplace-specific database."""
+        """
+        Save product to marketplace-specific database.
+        
+        Files are compact JSON unless pretty (default: config.pretty_json).
+        """
         asin = product.identification.asin
         mp = marketplace or self.marketplace
-        asin_dir = self._get_asin_dir(asin, mp)
+        pretty = config.pretty_json if pretty is None else pretty
+        
+        # Ensure marketplace is in meta
+        if product.meta.marketplace_code != mp:
+            product = product.model_copy(update={
+                'meta': product.meta.model_copy(update={'marketplace_code': mp})
+            })
         
-        async with self.lock:
-            product_dict = product.model_dump(mode='json', exclude_none=False)
+        # pydantic-core serializes straight to bytes, no intermediate dict
+        json_bytes = product.model_dump_json(indent=2 if pretty else None).encode('utf-8')
+        summary_bytes = json_utils.dumps(_model_price_summary(product), indent=False)
+        
+        return await self._store(asin, mp, json_bytes, summary_bytes, create_snapshot, product)
+    
+    async def save_products(
+        self,
+        products: List[EnhancedMasterProduct],
+        marketplace: str = None,
+        create_snapshot: bool = True,
+        pretty: bool = None
+    ) -> List[Path]:
+        """
+        Save several products at once.
+        
+        Everything is encoded up front and written in a single worker-thread
+        hop, instead of one lock/encode/thread round-trip per product.
+        """
+        mp = marketplace or self.marketplace
+        pretty = config.pretty_json if pretty is None else pretty
+        today = _utc_today()
+        
+        prepared = []
+        for product in products:
+            asin = product.identification.asin
+            # One product that cannot be encoded or placed must not cost
+            # the rest of the batch
+            try:
+                if product.meta.marketplace_code != mp:
+                    product = product.model_copy(update={
+                        'meta': product.meta.model_copy(update={'marketplace_code': mp})
+                    })
+                asin_dir = self._get_asin_dir(asin, mp)
+                prepared.append((
+                    asin,
+                    asin_dir,
+                    product.model_dump_json(indent=2 if pretty else None).encode('utf-8'),
+                    json_utils.dumps(_model_price_summary(product), indent=False),
+                    os.path.join(asin_dir, f"{today}.json") if create_snapshot else None,
+                    product,
+                ))
+            except Exception as e:
+                logger.error(f"Failed to save {asin}: {e}")
+        
+        # Take every stripe the batch touches, in index order so concurrent
+        # batches cannot deadlock against each other
+        stripes = sorted({self._lock_index(mp, item[0]) for item in prepared})
+        async with contextlib.AsyncExitStack() as stack:
+            for i in stripes:
+                await stack.enter_async_context(self._save_locks[i])
+            for item in prepared:
+                self._evict_product(mp, item[0])
+            written = await asyncio.to_thread(self._write_product_batch, prepared)
             
-            # Ensure marketplace is in meta
-            if 'meta' in product_dict and product_dict['meta']:
-                product_dict['meta']['marketplace_code'] = mp
+            for asin, latest_path, mtime_ns, product in written:
+                self._cache_product(mp, asin, mtime_ns, product.model_copy(deep=True))
+        
+        logger.info(f"Saved batch of {len(written)} products to {mp}/ database")
+        return [Path(latest_path) for _, latest_path, _, _ in written]
+    
+    async def save_product_dict(
+        self,
+        data: Dict[str, Any],
+        marketplace: str = None,
+        create_snapshot: bool = True,
+        pretty: bool = None
+    ) -> Path:
+        """Save an already-serialized product document without validating it."""
+        asin = data['identification']['asin']
+        mp = marketplace or self.marketplace
+        pretty = config.pretty_json if pretty is None else pretty
+        
+        meta = data.get('meta')
+        if meta is None:
+            meta = data['meta'] = {}
+        meta['marketplace_code'] = mp
+        
+        json_bytes = json_utils.dumps(data, indent=pretty)
+        summary_bytes = json_utils.dumps(build_price_summary(data), indent=False)
+        
+        return await self._store(asin, mp, json_bytes, summary_bytes, create_snapshot)
+    
+    async def _store(
+        self,
+        asin: str,
+        mp: str,
+        json_bytes: bytes,
+        summary_bytes: bytes,
+        create_snapshot: bool,
+        product: EnhancedMasterProduct = None
+    ) -> Path:
+        asin_dir = self._get_asin_dir(asin, mp)
+        
+        async with self._get_save_lock(mp, asin):
+            self._evict_product(mp, asin)
             
-            json_str = json.dumps(product_dict, indent=2, ensure_ascii=False)
+            snapshot_path = None
+            if create_snapshot:
+                today = _utc_today()
+                snapshot_path = os.path.join(asin_dir, f"{today}.json")
             
-            latest_path = asin_dir / "latest.json"
-            with open(latest_path, 'w', encoding='utf-8') as f:
-                f.write(json_str)
+            # All disk work for one save goes to a worker thread in a single
+            # hop, so the event loop keeps serving other saves meanwhile
+            try:
+                latest_path = await asyncio.to_thread(
+                    self._write_product_files, asin_dir, json_bytes, summary_bytes, snapshot_path
+                )
+            except FileNotFoundError:
+                # Directory removed behind our back; recreate it and retry once
+                self._ensured_dirs.discard(asin_dir)
+                self._ensure_dir(asin_dir)
+                latest_path = await asyncio.to_thread(
+                    self._write_product_files, asin_dir, json_bytes, summary_bytes, snapshot_path
+                )
             
-            if create_snapshot:
-                today = datetime.utcnow().strftime("%Y-%m-%d")
-                snapshot_path = asin_dir / f"{today}.json"
-                with open(snapshot_path, 'w', encoding='utf-8') as f:
-                    f.write(json_str)
+            # A validated save is exactly what get_product would load back,
+            # so cache it against the new mtime instead of re-reading later
+            if product is not None:
+                self._cache_product(mp, asin, os.stat(latest_path).st_mtime_ns, product.model_copy(deep=True))
             
             logger.info(f"Saved {asin} to {mp}/ database")
-            return latest_path
+            return Path(latest_path)
+    
+    def _get_save_lock(self, mp: str, asin: str) -> asyncio.Lock:
+        return self._save_locks[self._lock_index(mp, asin)]
+    
+    def _lock_index(self, mp: str, asin: str) -> int:
+        return hash((mp, asin)) % len(self._save_locks)
+    
+    def _evict_product(self, mp: str, asin: str):
+        self._product_cache.pop((mp, asin), None)
+    
+    def _cache_product(self, mp: str, asin: str, mtime_ns: int, product: EnhancedMasterProduct):
+        key = (mp, asin)
+        self._product_cache[key] = (mtime_ns, product)
+        self._product_cache.move_to_end(key)
+        if len(self._product_cache) > PRODUCT_CACHE_SIZE:
+            self._product_cache.popitem(last=False)
+    
+    @classmethod
+    def _write_product_files(
+        cls,
+        asin_dir: str,
+        json_bytes: bytes,
+        summary_bytes: bytes,
+        snapshot_path: Optional[str]
+    ) -> str:
+        # Leaf paths stay plain str: the OS calls take them as-is, with no
+        # Path allocation or __fspath__ per save
+        latest_path = os.path.join(asin_dir, "latest.json")
+        # write_bytes renames into place, so a snapshot hardlinked to the
+        # previous latest.json keeps its content
+        json_utils.write_bytes(latest_path, json_bytes)
+        
+        if snapshot_path is not None:
+            cls._link_snapshot(latest_path, snapshot_path, json_bytes)
+        
+        json_utils.write_bytes(os.path.join(asin_dir, SUMMARY_FILENAME), summary_bytes)
+        return latest_path
+    
+    @classmethod
+    def _write_product_batch(cls, prepared: List[tuple]) -> List[tuple]:
+        written = []
+        for asin, asin_dir, json_bytes, summary_bytes, snapshot_path, product in prepared:
+            try:
+                try:
+                    latest_path = cls._write_product_files(
+                        asin_dir, json_bytes, summary_bytes, snapshot_path
+                    )
+                except FileNotFoundError:
+                    # Directory removed behind our back; recreate it and retry once
+                    os.makedirs(asin_dir, exist_ok=True)
+                    latest_path = cls._write_product_files(
+                        asin_dir, json_bytes, summary_bytes, snapshot_path
+                    )
+                written.append((asin, latest_path, os.stat(latest_path).st_mtime_ns, product))
+            except Exception as e:
+                logger.error(f"Failed to save {asin}: {e}")
+        return written
+    
+    @staticmethod
+    def _link_snapshot(latest_path: str, snapshot_path: str, payload: bytes):
+        """
+        Point snapshot_path at latest_path's bytes without writing them again.
+        
+        Falls back to an in-kernel copy where hardlinks are refused, and to
+        writing payload (latest_path's content) where that is refused too.
+        """
+        tmp_link = f"{snapshot_path}.tmp"
+        try:
+            try:
+                os.unlink(tmp_link)
+            except FileNotFoundError:
+                pass
+            os.link(latest_path, tmp_link)
+        except OSError:
+            copied = False
+            if hasattr(os, "copy_file_range"):
+                try:
+                    _copy_file_range(latest_path, tmp_link)
+                    copied = True
+                except OSError:
+                    # EXDEV/ENOTSUP on older kernels
+                    pass
+            if not copied:
+                # The bytes are still in hand, so write them rather than read back
+                with open(tmp_link, 'wb') as f:
+                    f.write(payload)
+        os.replace(tmp_link, snapshot_path)
     
     def get_product(self, asin: str, marketplace: str = None) -> Optional[EnhancedMasterProduct]:
         """Load latest product data from database."""
         mp = marketplace or self.marketplace
-        latest_path = self.db_dir / mp / asin / "latest.json"
+        latest_path = os.path.join(self.db_dir, mp, asin, "latest.json")
         
-        if not latest_path.exists():
+        try:
+            mtime_ns = os.stat(latest_path).st_mtime_ns
+        except OSError:
             logger.warning(f"Product not found: {mp}/{asin}")
             return None
         
+        key = (mp, asin)
+        cached = self._product_cache.get(key)
+        if cached is not None and cached[0] == mtime_ns:
+            self._product_cache.move_to_end(key)
+            # Callers assign fields, nested ones included, before saving;
+            # a deep copy keeps the cached product clean
+            return cached[1].model_copy(deep=True)
+        
         try:
-            with open(latest_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            return EnhancedMasterProduct(**data)
+            data = json_utils.read_json(latest_path)
+            product = EnhancedMasterProduct.model_validate(data)
         except Exception as e:
             logger.error(f"Failed to load {mp}/{asin}: {e}")
             return None
+        
+        self._cache_product(mp, asin, mtime_ns, product)
+        return product.model_copy(deep=True)
     
     def get_product_history(self, asin: str, marketplace: str = None) -> List[Path]:
         """Get all historical snapshots for a product."""
         mp = marketplace or self.marketplace
         asin_dir = self.db_dir / mp / asin
-        if not asin_dir.exists():
+        try:
+            with os.scandir(asin_dir) as it:
+                names = [
+                    e.name for e in it
+                    if e.name.endswith(".json")
+                    and e.name != "latest.json" and e.name != SUMMARY_FILENAME
+                ]
+        except (FileNotFoundError, NotADirectoryError):
             return []
-        return sorted([f for f in asin_dir.glob("*.json") if f.name != "latest.json"])
+        return [asin_dir / name for name in sorted(names)]
+    
+    def iter_all_products(self, marketplace: str = None) -> Iterator[str]:
+        """Yield ASINs in a marketplace in directory order, without sorting."""
+        mp = marketplace or self.marketplace
+        yield from _iter_subdirs(self.db_dir / mp)
     
     def list_all_products(self, marketplace: str = None) -> List[str]:
         """List all ASINs in a marketplace."""
-        mp = marketplace or self.marketplace
-        mp_dir = self.db_dir / mp
-        if not mp_dir.exists():
-            return []
-        return sorted([d.name for d in mp_dir.iterdir() if d.is_dir()])
+        return sorted(self.iter_all_products(marketplace))
+    
+    def count_products(self, marketplace: str = None) -> int:
+        """
+        Number of ASINs stored for a marketplace, or across all of them.
+        
+        One directory listing per marketplace; unlike get_stats it never
+        descends into the ASIN directories to stat every snapshot.
+        """
+        marketplaces = [marketplace] if marketplace else self.list_all_marketplaces()
+        return sum(sum(1 for _ in _iter_subdirs(self.db_dir / mp)) for mp in marketplaces)
     
     def list_all_marketplaces(self) -> List[str]:
         """List all marketplaces with data."""
-        if not self.db_dir.exists():
-            return []
-        return sorted([d.name for d in self.db_dir.iterdir() if d.is_dir()])
+        return sorted(_iter_subdirs(self.db_dir))
+    
+    def report_filename(self, asin: str, marketplace: str = None) -> str:
+        """Name of today's analysis report for an ASIN."""
+        mp = marketplace or self.marketplace
+        return f"{mp}_{asin}_{_utc_today()}_analysis.json"
     
-    async def save_report(self, report_data: dict, filename: str) -> Path:
-        """Save analysis report to output/reports/."""
-        reports_dir = self.output_dir / "reports"
-        reports_dir.mkdir(parents=True, exist_ok=True)
+    async def save_report(self, report_data: Union[dict, BaseModel, bytes], filename: str) -> Path:
+        """
+        Save analysis report to output/reports/.
         
-        filepath = reports_dir / filename
-        json_str = json.dumps(report_data, indent=2, ensure_ascii=False)
+        Pydantic models are serialized directly by pydantic-core; pass the
+        model rather than its model_dump() to skip the intermediate dict.
+        Bytes are taken as already-encoded JSON and written as-is.
+        """
+        reports_dir = os.path.join(self.output_dir, "reports")
+        self._ensure_dir(reports_dir)
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(json_str)
+        filepath = Path(reports_dir, filename)
+        if isinstance(report_data, bytes):
+            json_bytes = report_data
+        elif isinstance(report_data, BaseModel):
+            json_bytes = report_data.model_dump_json(indent=2).encode('utf-8')
+        else:
+            json_bytes = json_utils.dumps(report_data)
+        await asyncio.to_thread(json_utils.write_bytes, filepath, json_bytes)
         
         logger.info(f"Saved report: {filepath}")
         return filepath
@@ -211,24 +657,17 @@ class DataImporter:
         mp_stats = {}
         
         for mp in marketplaces:
-            products = self.list_all_products(mp)
-            mp_snapshots = 0
-            mp_size = 0
-            
-            for asin in products:
-                asin_dir = self.db_dir / mp / asin
-                for f in asin_dir.glob("*.json"):
-                    mp_size += f.stat().st_size
-                    if f.name != "latest.json":
-                        mp_snapshots += 1
+            mp_products, mp_snapshots, mp_size = _scan_marketplace_dir(
+                os.path.join(self.db_dir, mp)
+            )
             
             mp_stats[mp] = {
-                "products": len(products),
+                "products": mp_products,
                 "snapshots": mp_snapshots,
                 "size_mb": round(mp_size / (1024 * 1024), 2)
             }
             
-            total_products += len(products)
+            total_products += mp_products
             total_snapshots += mp_snapshots
             total_size += mp_size
         
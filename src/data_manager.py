@@ -1,71 +1,115 @@
 import asyncio
 import json
 import logging
+import os
 from pathlib import Path
-from typing import List
-import aiofiles
+from typing import AsyncIterator, List
 from .models import MasterProduct
+from . import json_utils
 
 logger = logging.getLogger(__name__)
 
+# Bytes of whole lines pulled per worker-thread hop by DataManager.load_all
+READ_CHUNK_SIZE = 1 << 20
+
+
+def _to_json_line(product: MasterProduct) -> bytes:
+    """Serialize straight to UTF-8 bytes with pydantic-core, skipping the dict/str round-trip."""
+    return product.__pydantic_serializer__.to_json(product) + b"\n"
+
+
+def _append(filename: str, data: bytes, sync: bool = False):
+    """Append data to filename, optionally forcing it to disk."""
+    with open(filename, 'ab') as f:
+        f.write(data)
+        if sync:
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _migrate_legacy_file(filename: str):
+    """
+    Convert the pre-JSON Lines store (one JSON array in the same name with a
+    .json suffix, e.g. products.json) into filename, if filename does not
+    exist yet. The legacy file is left in place.
+    """
+    legacy = Path(filename).with_suffix(".json")
+    if legacy == Path(filename) or os.path.exists(filename) or not legacy.exists():
+        return
+    try:
+        records = json_utils.read_json(legacy)
+        if not isinstance(records, list):
+            raise ValueError("expected a JSON array of products")
+        data = b"".join(json_utils.dumps(record, indent=False) + b"\n" for record in records)
+        json_utils.write_bytes(filename, data)
+        logger.info(f"Migrated {len(records)} products from {legacy} to {filename}")
+    except Exception as e:
+        logger.error(f"Failed to migrate {legacy} to {filename}: {e}")
+
+
 class DataManager:
     """
     Handles asynchronous file I/O for storing product data.
-    Ensures data integrity during saves.
+    Products are appended as JSON Lines, so each save costs O(1)
+    regardless of how many products are already stored. An older
+    products.json array store is migrated on first use.
     """
-    def __init__(self, filename: str = "products.json"):
+    def __init__(self, filename: str = "products.jsonl"):
         self.filename = filename
         self.lock = asyncio.Lock()
+        self._migrated = False
 
-    async def _read_file(self) -> List[dict]:
-        path = Path(self.filename)
-        if not path.exists():
-            return []
+    async def _migrate_legacy(self):
+        """Run the one-time legacy migration; call with self.lock held."""
+        if not self._migrated:
+            await asyncio.to_thread(_migrate_legacy_file, self.filename)
+            self._migrated = True
+
+    async def load_all(self) -> AsyncIterator[dict]:
+        """Stream stored products one line at a time, skipping corrupt lines."""
+        async with self.lock:
+            await self._migrate_legacy()
+        if not Path(self.filename).exists():
+            return
         
         try:
-            async with aiofiles.open(self.filename, mode='r') as f:
-                content = await f.read()
-                if not content.strip():
-                    return []
-                return json.loads(content)
-        except json.JSONDecodeError:
-            logger.error(f"Corrupt JSON in {self.filename}, backing up and starting fresh.")
-            if path.exists():
-                path.rename(f"{self.filename}.bak")
-            return []
+            f = await asyncio.to_thread(open, self.filename, 'rb')
+            try:
+                # One thread hop per ~READ_CHUNK_SIZE of lines, not per line
+                while lines := await asyncio.to_thread(f.readlines, READ_CHUNK_SIZE):
+                    for line in lines:
+                        if not line.strip():
+                            continue
+                        try:
+                            yield json_utils.loads(line)
+                        except json.JSONDecodeError:
+                            logger.error(f"Skipping corrupt line in {self.filename}")
+            finally:
+                f.close()
         except Exception as e:
             logger.error(f"Error reading {self.filename}: {e}")
-            return []
+
+    async def _read_file(self) -> List[dict]:
+        return [record async for record in self.load_all()]
 
     async def save_product(self, product: MasterProduct):
-        """Thread-safe append of a single product to the JSON array."""
+        """Thread-safe append of a single product as one JSON line."""
         async with self.lock:
-            data = await self._read_file()
-            product_dict = product.model_dump(mode='json')
-            data.append(product_dict)
-            
+            await self._migrate_legacy()
             try:
-                temp_filename = f"{self.filename}.tmp"
-                async with aiofiles.open(temp_filename, mode='w') as f:
-                    await f.write(json.dumps(data, indent=2))
-                
-                Path(temp_filename).replace(self.filename)
+                await asyncio.to_thread(_append, self.filename, _to_json_line(product))
                 logger.info(f"Saved product {product.identification.asin} to {self.filename}")
             except Exception as e:
                 logger.error(f"Failed to save product: {e}")
 
     async def save_batch(self, products: List[MasterProduct]):
-        """Thread-safe batch save."""
+        """Thread-safe batch append."""
         async with self.lock:
-            data = await self._read_file()
-            for p in products:
-                data.append(p.model_dump(mode='json'))
-            
+            await self._migrate_legacy()
             try:
-                temp_filename = f"{self.filename}.tmp"
-                async with aiofiles.open(temp_filename, mode='w') as f:
-                    await f.write(json.dumps(data, indent=2))
-                Path(temp_filename).replace(self.filename)
+                lines = b"".join(_to_json_line(p) for p in products)
+                # One fsync per batch rather than per product
+                await asyncio.to_thread(_append, self.filename, lines, True)
                 logger.info(f"Saved batch of {len(products)} products to {self.filename}")
             except Exception as e:
                 logger.error(f"Failed to save batch: {e}")
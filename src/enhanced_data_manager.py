@@ -4,18 +4,40 @@ Saves comprehensive product data to product_datas/ directory.
 """
 from __future__ import annotations
 import asyncio
-import json
+import contextlib
 import logging
+import os
+import time
+from collections import OrderedDict
 from pathlib import Path
-from datetime import datetime, date
+from datetime import datetime, date, timedelta, timezone, time as dt_time
 from typing import List, Optional, Union
-import aiofiles
 
-from .enhanced_models import EnhancedMasterProduct
+from .enhanced_models import EnhancedMasterProduct, MerchantAnalysisOutput
 from .models import MasterProduct
+from .config_manager import config
+from . import json_utils
 
 logger = logging.getLogger(__name__)
 
+SAVE_LOCK_STRIPES = 64
+PRODUCT_CACHE_SIZE = 1024
+
+# (YYYY-MM-DD, epoch second of the next local midnight)
+_today_local = ("", 0.0)
+
+
+def _local_today() -> str:
+    """Current local date string, formatted once per day rather than per call."""
+    global _today_local
+    now = time.time()
+    value, valid_until = _today_local
+    if now >= valid_until:
+        today = date.today()
+        value = today.isoformat()
+        _today_local = (value, datetime.combine(today + timedelta(days=1), dt_time.min).timestamp())
+    return value
+
 
 class EnhancedDataManager:
     """
@@ -26,14 +48,18 @@ class EnhancedDataManager:
     def __init__(self, base_dir: str = "product_datas"):
         self.base_dir = Path(base_dir)
         self.base_dir.mkdir(parents=True, exist_ok=True)
-        self.lock = asyncio.Lock()
+        # Striped per ASIN, so saves of different products run concurrently
+        self._save_locks = [asyncio.Lock() for _ in range(SAVE_LOCK_STRIPES)]
+        
+        # file path -> (mtime_ns, validated product); a rewrite changes the
+        # mtime, and saves evict their path directly
+        self._product_cache: OrderedDict[Path, tuple] = OrderedDict()
         logger.info(f"EnhancedDataManager initialized: {self.base_dir.absolute()}")
     
     def _get_filename(self, asin: str, include_date: bool = True) -> str:
         """Generate filename for a product."""
         if include_date:
-            today = date.today().isoformat()
-            return f"{asin}_{today}.json"
+            return f"{asin}_{_local_today()}.json"
         return f"{asin}.json"
     
     def _get_filepath(self, asin: str, include_date: bool = True) -> Path:
@@ -44,7 +70,7 @@ class EnhancedDataManager:
         self, 
         product: Union[EnhancedMasterProduct, MasterProduct],
         with_date_suffix: bool = True,
-        pretty_print: bool = True
+        pretty_print: bool = None
     ) -> Path:
         """
         Save a single product to JSON file.
@@ -53,22 +79,24 @@ class EnhancedDataManager:
             product: Product data to save
             with_date_suffix: If True, filename includes date (ASIN_2026-02-01.json)
             pretty_print: If True, JSON is formatted with indentation
+                (default: config.pretty_json)
             
         Returns:
             Path to saved file
         """
         asin = product.identification.asin
         filepath = self._get_filepath(asin, with_date_suffix)
+        if pretty_print is None:
+            pretty_print = config.pretty_json
         
-        async with self.lock:
+        async with self._save_locks[self._lock_index(asin)]:
             try:
-                product_dict = product.model_dump(mode='json', exclude_none=False)
-                
                 indent = 2 if pretty_print else None
-                json_str = json.dumps(product_dict, indent=indent, ensure_ascii=False)
+                json_bytes = product.model_dump_json(indent=indent).encode('utf-8')
                 
-                async with aiofiles.open(filepath, mode='w', encoding='utf-8') as f:
-                    await f.write(json_str)
+                # Same atomic writer as DataImporter, in one thread hop
+                await asyncio.to_thread(json_utils.write_bytes, filepath, json_bytes)
+                self._evict_path(filepath)
                 
                 logger.info(f"Saved product {asin} to {filepath}")
                 return filepath
@@ -80,18 +108,55 @@ class EnhancedDataManager:
     async def save_batch(
         self,
         products: List[Union[EnhancedMasterProduct, MasterProduct]],
-        with_date_suffix: bool = True
+        with_date_suffix: bool = True,
+        pretty_print: bool = None
     ) -> List[Path]:
-        """Save multiple products."""
-        saved_paths = []
+        """
+        Save multiple products.
+        
+        Everything is encoded up front and written in a single worker-thread
+        hop, instead of one lock/encode/thread round-trip per product.
+        """
+        indent = 2 if (config.pretty_json if pretty_print is None else pretty_print) else None
+        prepared = []
         for product in products:
             try:
-                path = await self.save_product(product, with_date_suffix)
-                saved_paths.append(path)
+                asin = product.identification.asin
+                json_bytes = product.model_dump_json(indent=indent).encode('utf-8')
+                prepared.append((asin, self._get_filepath(asin, with_date_suffix), json_bytes))
             except Exception as e:
                 logger.error(f"Failed to save product: {e}")
+        
+        # Take every stripe the batch touches, in index order so concurrent
+        # batches cannot deadlock against each other
+        stripes = sorted({self._lock_index(asin) for asin, _, _ in prepared})
+        async with contextlib.AsyncExitStack() as stack:
+            for i in stripes:
+                await stack.enter_async_context(self._save_locks[i])
+            saved_paths = await asyncio.to_thread(self._write_batch, prepared)
+        
+        for path in saved_paths:
+            self._evict_path(path)
+        logger.info(f"Saved batch of {len(saved_paths)} products to {self.base_dir}")
+        return saved_paths
+    
+    @staticmethod
+    def _write_batch(prepared: List[tuple]) -> List[Path]:
+        saved_paths = []
+        for asin, filepath, json_bytes in prepared:
+            try:
+                json_utils.write_bytes(filepath, json_bytes)
+                saved_paths.append(filepath)
+            except Exception as e:
+                logger.error(f"Failed to save product {asin}: {e}")
         return saved_paths
     
+    def _lock_index(self, asin: str) -> int:
+        return hash(asin) % len(self._save_locks)
+    
+    def _evict_path(self, filepath: Path):
+        self._product_cache.pop(filepath, None)
+    
     async def load_product(self, asin: str, date_str: Optional[str] = None) -> Optional[EnhancedMasterProduct]:
         """
         Load a product from JSON file.
@@ -103,6 +168,54 @@ class EnhancedDataManager:
         Returns:
             Loaded product or None if not found
         """
+        filepath = self._resolve_product_path(asin, date_str)
+        if filepath is None:
+            return None
+        
+        try:
+            mtime_ns = filepath.stat().st_mtime_ns
+            cached = self._get_cached(filepath, mtime_ns)
+            if cached is not None:
+                return cached
+            
+            content = await asyncio.to_thread(filepath.read_bytes)
+            data = json_utils.loads(content)
+            product = EnhancedMasterProduct.model_validate(data)
+            
+        except Exception as e:
+            logger.error(f"Failed to load product {asin}: {e}")
+            return None
+        
+        return self._cache_product(filepath, mtime_ns, product)
+    
+    def load_product_sync(self, asin: str, date_str: Optional[str] = None) -> Optional[EnhancedMasterProduct]:
+        """
+        Synchronous version of load_product.
+        
+        Reads the file directly instead of spinning up an event loop, so it
+        is cheap and also safe to call from a thread that is running one.
+        """
+        filepath = self._resolve_product_path(asin, date_str)
+        if filepath is None:
+            return None
+        
+        try:
+            mtime_ns = filepath.stat().st_mtime_ns
+            cached = self._get_cached(filepath, mtime_ns)
+            if cached is not None:
+                return cached
+            
+            data = json_utils.loads(filepath.read_bytes())
+            product = EnhancedMasterProduct.model_validate(data)
+            
+        except Exception as e:
+            logger.error(f"Failed to load product {asin}: {e}")
+            return None
+        
+        return self._cache_product(filepath, mtime_ns, product)
+    
+    def _resolve_product_path(self, asin: str, date_str: Optional[str]) -> Optional[Path]:
+        """Return the file load_product reads, falling back to the undated name."""
         if date_str:
             filename = f"{asin}_{date_str}.json"
         else:
@@ -113,34 +226,48 @@ class EnhancedDataManager:
         if not filepath.exists():
             filepath_no_date = self.base_dir / f"{asin}.json"
             if filepath_no_date.exists():
-                filepath = filepath_no_date
-            else:
-                logger.warning(f"Product file not found: {filepath}")
-                return None
-        
-        try:
-            async with aiofiles.open(filepath, mode='r', encoding='utf-8') as f:
-                content = await f.read()
-            
-            data = json.loads(content)
-            return EnhancedMasterProduct(**data)
-            
-        except Exception as e:
-            logger.error(f"Failed to load product {asin}: {e}")
+                return filepath_no_date
+            logger.warning(f"Product file not found: {filepath}")
             return None
+        return filepath
     
-    def load_product_sync(self, asin: str, date_str: Optional[str] = None) -> Optional[EnhancedMasterProduct]:
-        """Synchronous version of load_product."""
-        return asyncio.run(self.load_product(asin, date_str))
+    def _get_cached(self, filepath: Path, mtime_ns: int) -> Optional[EnhancedMasterProduct]:
+        """Return a private copy of the cached product if the file is unchanged."""
+        cached = self._product_cache.get(filepath)
+        if cached is None or cached[0] != mtime_ns:
+            return None
+        self._product_cache.move_to_end(filepath)
+        # Deep, so callers mutating nested sections cannot touch the cache
+        return cached[1].model_copy(deep=True)
+    
+    def _cache_product(self, filepath: Path, mtime_ns: int, product: EnhancedMasterProduct) -> EnhancedMasterProduct:
+        """Remember a freshly loaded product and hand back a private copy."""
+        self._product_cache[filepath] = (mtime_ns, product)
+        self._product_cache.move_to_end(filepath)
+        if len(self._product_cache) > PRODUCT_CACHE_SIZE:
+            self._product_cache.popitem(last=False)
+        return product.model_copy(deep=True)
     
     def list_products(self, asin_filter: Optional[str] = None) -> List[Path]:
         """List all product files, optionally filtered by ASIN prefix."""
-        pattern = f"{asin_filter}*.json" if asin_filter else "*.json"
-        return sorted(self.base_dir.glob(pattern))
+        return self._list_json(asin_filter or "")
     
     def get_product_history(self, asin: str) -> List[Path]:
         """Get all historical snapshots for a product."""
-        return sorted(self.base_dir.glob(f"{asin}_*.json"))
+        return self._list_json(f"{asin}_")
+    
+    def _list_json(self, prefix: str) -> List[Path]:
+        # Plain name matching over one scandir pass instead of glob
+        try:
+            with os.scandir(self.base_dir) as it:
+                names = [
+                    e.name for e in it
+                    if e.name.startswith(prefix) and e.name.endswith(".json")
+                    and e.is_file()
+                ]
+        except FileNotFoundError:
+            return []
+        return [self.base_dir / name for name in sorted(names)]
     
     async def merge_with_analysis(
         self,
@@ -158,45 +285,43 @@ class EnhancedDataManager:
             Enhanced product with embedded analysis
         """
         if isinstance(product, MasterProduct):
-            product_dict = product.model_dump(mode='json')
+            product_dict = product.model_dump()
             if 'meta' not in product_dict:
                 product_dict['meta'] = {
                     'schema_version': '2.0.0',
-                    'scraped_at': product_dict.get('scraped_at', datetime.utcnow().isoformat()),
+                    'scraped_at': product_dict.get('scraped_at') or datetime.now(timezone.utc).isoformat(),
                     'source': 'amazon_us',
                     'data_quality_score': product_dict.get('data_quality_score', 0.0)
                 }
-            enhanced = EnhancedMasterProduct(**product_dict)
+            enhanced = EnhancedMasterProduct.model_validate(product_dict)
         else:
             enhanced = product
         
-        from .analysis_models import MerchantAnalysisReport
-        if isinstance(analysis_dict, MerchantAnalysisReport):
-            analysis_dict = analysis_dict.model_dump(mode='json')
-        
-        from .enhanced_models import MerchantAnalysisOutput
-        enhanced.merchant_analysis = MerchantAnalysisOutput(
-            arbitrage_analysis=analysis_dict.get('arbitrage_analysis'),
-            private_label_analysis=analysis_dict.get('private_label_analysis'),
-            risk_analysis=analysis_dict.get('risk_analysis'),
-            verdict=analysis_dict.get('verdict'),
-            analyzed_at=analysis_dict.get('analysis_timestamp')
-        )
+        # Accepts the report model or its JSON-mode dump
+        enhanced.merchant_analysis = MerchantAnalysisOutput.from_report(analysis_dict)
         
         return enhanced
     
     def get_stats(self) -> dict:
         """Get storage statistics."""
-        files = list(self.base_dir.glob("*.json"))
-        total_size = sum(f.stat().st_size for f in files)
-        
+        total_files = 0
+        total_size = 0
         unique_asins = set()
-        for f in files:
-            asin = f.stem.split('_')[0]
-            unique_asins.add(asin)
+        
+        # One streaming scandir pass; the ASIN is the name up to the first
+        # '_' (or the extension), sliced without building a split list
+        with os.scandir(self.base_dir) as it:
+            for entry in it:
+                name = entry.name
+                if not name.endswith(".json"):
+                    continue
+                total_files += 1
+                total_size += entry.stat().st_size
+                idx = name.find('_')
+                unique_asins.add(name[:idx] if idx >= 0 else name[:-5])
         
         return {
-            "total_files": len(files),
+            "total_files": total_files,
             "unique_products": len(unique_asins),
             "total_size_bytes": total_size,
             "total_size_mb": round(total_size / (1024 * 1024), 2),
@@ -5,14 +5,24 @@ Schema Version: 2.0.0
 """
 from __future__ import annotations
 from typing import List, Optional, Dict, Any, Literal
-from datetime import datetime
-from pydantic import BaseModel, Field, HttpUrl
+from datetime import datetime, timezone
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic.dataclasses import dataclass
+
+# Validators and serializers are built on first use rather than at import,
+# so commands that never touch a section (--stats, --list-db) never pay
+# for its schema.
+_SCHEMA_CONFIG = ConfigDict(defer_build=True)
+
+# URL fields are plain str: they come from our own parser, and per-field
+# HttpUrl validation would cost a URL parse for every image and video link.
 
 
 class MetaInfo(BaseModel):
     """Metadata about the scraped data."""
+    model_config = _SCHEMA_CONFIG
     schema_version: str = "2.0.0"
-    scraped_at: datetime = Field(default_factory=datetime.utcnow)
+    scraped_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     source: str = "amazon_us"
     marketplace: str = "amazon.com"
     marketplace_code: str = "us"  # us, uk, de, fr, es, it, ca, jp
@@ -25,6 +35,7 @@ class MetaInfo(BaseModel):
 
 class Identification(BaseModel):
     """Product identification and basic info."""
+    model_config = _SCHEMA_CONFIG
     asin: str
     parent_asin: Optional[str] = None
     ean_upc: Optional[str] = None
@@ -44,21 +55,27 @@ class Identification(BaseModel):
     product_group: Optional[str] = None
 
 
-class PriceHistoryPoint(BaseModel):
+# Records that only ever appear as items of List[...] fields, and can number
+# in the hundreds per product, are slotted pydantic dataclasses: no per-item
+# __dict__ or BaseModel bookkeeping, and they validate faster.
+@dataclass(slots=True, kw_only=True)
+class PriceHistoryPoint:
     """Single price history data point."""
     date: str
     price: float
     source: str = "buybox"
 
 
-class BSRHistoryPoint(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class BSRHistoryPoint:
     """Single BSR history data point."""
     date: str
     bsr: int
     category: str
 
 
-class SubcategoryRank(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class SubcategoryRank:
     """BSR rank in a subcategory."""
     category: str
     rank: int
@@ -66,6 +83,7 @@ class SubcategoryRank(BaseModel):
 
 class SalesAnalytics(BaseModel):
     """Sales performance metrics."""
+    model_config = _SCHEMA_CONFIG
     bsr_current: Optional[int] = None
     bsr_category: Optional[str] = None
     bsr_90_day_avg: Optional[int] = None
@@ -92,6 +110,7 @@ class SalesAnalytics(BaseModel):
 
 class PricingMechanics(BaseModel):
     """Pricing information and history."""
+    model_config = _SCHEMA_CONFIG
     buy_box_price: Optional[float] = None
     currency: str = "USD"
     list_price: Optional[float] = None
@@ -131,7 +150,8 @@ class PricingMechanics(BaseModel):
     prime_exclusive_deal: bool = False
 
 
-class CompetitorInfo(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class CompetitorInfo:
     """Individual competitor details."""
     seller_id: str
     seller_name: Optional[str] = None
@@ -145,7 +165,8 @@ class CompetitorInfo(BaseModel):
     stock_estimate: Optional[int] = None
 
 
-class CompetitorStockLevel(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class CompetitorStockLevel:
     """Competitor stock tracking."""
     seller_id: str
     stock: int
@@ -154,6 +175,7 @@ class CompetitorStockLevel(BaseModel):
 
 class CompetitionAndInventory(BaseModel):
     """Competitive landscape analysis."""
+    model_config = _SCHEMA_CONFIG
     total_offer_count: Optional[int] = None
     new_offer_count: Optional[int] = None
     used_offer_count: Optional[int] = None
@@ -179,6 +201,7 @@ class CompetitionAndInventory(BaseModel):
 
 class RatingBreakdown(BaseModel):
     """Star rating distribution."""
+    model_config = _SCHEMA_CONFIG
     five_star: Optional[int] = Field(None, alias="5_star")
     four_star: Optional[int] = Field(None, alias="4_star")
     three_star: Optional[int] = Field(None, alias="3_star")
@@ -186,7 +209,8 @@ class RatingBreakdown(BaseModel):
     one_star: Optional[int] = Field(None, alias="1_star")
 
 
-class ReviewSample(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class ReviewSample:
     """Individual review sample for training."""
     stars: int
     title: str
@@ -198,7 +222,8 @@ class ReviewSample(BaseModel):
     reviewer_id: Optional[str] = None
 
 
-class ReviewHistoryPoint(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class ReviewHistoryPoint:
     """Review count history."""
     date: str
     review_count: int
@@ -207,6 +232,7 @@ class ReviewHistoryPoint(BaseModel):
 
 class SentimentAndQuality(BaseModel):
     """Customer sentiment and review analysis."""
+    model_config = _SCHEMA_CONFIG
     rating_overall: Optional[float] = None
     rating_recent_trend: Optional[str] = None
     review_count: Optional[int] = None
@@ -240,6 +266,7 @@ class SentimentAndQuality(BaseModel):
 
 class Dimensions(BaseModel):
     """Physical dimensions."""
+    model_config = _SCHEMA_CONFIG
     length: Optional[float] = None
     width: Optional[float] = None
     height: Optional[float] = None
@@ -248,6 +275,7 @@ class Dimensions(BaseModel):
 
 class LogisticsAndPhysical(BaseModel):
     """Physical attributes and logistics."""
+    model_config = _SCHEMA_CONFIG
     item_weight_grams: Optional[float] = None
     item_weight_oz: Optional[float] = None
     package_weight_grams: Optional[float] = None
@@ -280,6 +308,7 @@ class LogisticsAndPhysical(BaseModel):
 
 class ListingQuality(BaseModel):
     """SEO and listing optimization metrics."""
+    model_config = _SCHEMA_CONFIG
     title_length: Optional[int] = None
     title_word_count: Optional[int] = None
     title_keyword_count: Optional[int] = None
@@ -318,6 +347,7 @@ class ListingQuality(BaseModel):
 
 class ContentAssets(BaseModel):
     """Media and content assets."""
+    model_config = _SCHEMA_CONFIG
     main_image_url: Optional[str] = None
     gallery_images: List[str] = Field(default_factory=list)
     video_urls: List[str] = Field(default_factory=list)
@@ -334,7 +364,8 @@ class ContentAssets(BaseModel):
     safety_warnings: Optional[str] = None
 
 
-class VariationInfo(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class VariationInfo:
     """Individual product variation."""
     asin: str
     attribute_name: Optional[str] = None
@@ -346,6 +377,7 @@ class VariationInfo(BaseModel):
 
 class Variations(BaseModel):
     """Product variation data."""
+    model_config = _SCHEMA_CONFIG
     is_variation_parent: bool = False
     is_variation_child: bool = False
     parent_asin: Optional[str] = None
@@ -358,6 +390,7 @@ class Variations(BaseModel):
 
 class DemandSignals(BaseModel):
     """Market demand indicators."""
+    model_config = _SCHEMA_CONFIG
     search_volume_main_kw: Optional[int] = None
     search_volume_trend: Optional[str] = None
     keyword_difficulty: Optional[int] = None
@@ -379,6 +412,7 @@ class DemandSignals(BaseModel):
 
 class RiskAssessment(BaseModel):
     """Risk and compliance analysis."""
+    model_config = _SCHEMA_CONFIG
     ip_infringement_risk: Optional[str] = None
     trademark_protection: Optional[str] = None
     brand_gating: bool = False
@@ -402,7 +436,8 @@ class RiskAssessment(BaseModel):
     risk_flags: List[str] = Field(default_factory=list)
 
 
-class ProfitScenario(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class ProfitScenario:
     """Profit calculation for a scenario."""
     scenario_name: str
     buy_price: float
@@ -415,6 +450,7 @@ class ProfitScenario(BaseModel):
 
 class ProfitCalculations(BaseModel):
     """Comprehensive profit analysis."""
+    model_config = _SCHEMA_CONFIG
     estimated_cogs: Optional[float] = None
     target_cogs_25pct: Optional[float] = None
     target_cogs_30pct: Optional[float] = None
@@ -435,13 +471,41 @@ class ProfitCalculations(BaseModel):
     recommended_max_buy_price: Optional[float] = None
 
 
+# MerchantAnalysisReport fields MerchantAnalysisOutput is built from; dumping
+# only these skips the rest of the report when embedding it
+ANALYSIS_REPORT_FIELDS = frozenset({
+    'arbitrage_analysis', 'private_label_analysis', 'risk_analysis',
+    'verdict', 'analysis_timestamp',
+})
+
+
 class MerchantAnalysisOutput(BaseModel):
     """Embedded merchant engine analysis."""
+    model_config = _SCHEMA_CONFIG
     arbitrage_analysis: Optional[Dict[str, Any]] = None
     private_label_analysis: Optional[Dict[str, Any]] = None
     risk_analysis: Optional[Dict[str, Any]] = None
     verdict: Optional[Dict[str, Any]] = None
     analyzed_at: Optional[str] = None
+    
+    @classmethod
+    def from_report(cls, report: Any) -> MerchantAnalysisOutput:
+        """
+        Build from a MerchantAnalysisReport or its JSON-mode dump.
+        
+        A report model is dumped once, limited to the embedded sections.
+        Those are plain JSON dicts, exactly what this model holds, so they
+        are attached without another validation pass.
+        """
+        if isinstance(report, BaseModel):
+            report = report.model_dump(mode='json', include=ANALYSIS_REPORT_FIELDS)
+        return cls.model_construct(
+            arbitrage_analysis=report.get('arbitrage_analysis'),
+            private_label_analysis=report.get('private_label_analysis'),
+            risk_analysis=report.get('risk_analysis'),
+            verdict=report.get('verdict'),
+            analyzed_at=report.get('analysis_timestamp')
+        )
 
 
 class EnhancedMasterProduct(BaseModel):
@@ -449,6 +513,7 @@ class EnhancedMasterProduct(BaseModel):
     Comprehensive product data model for LLM training.
     Schema Version: 2.0.0
     """
+    model_config = ConfigDict(defer_build=True, populate_by_name=True)
     meta: MetaInfo = Field(default_factory=MetaInfo)
     identification: Identification
     sales_analytics: Optional[SalesAnalytics] = None
@@ -463,6 +528,3 @@ class EnhancedMasterProduct(BaseModel):
     risk_assessment: Optional[RiskAssessment] = None
     profit_calculations: Optional[ProfitCalculations] = None
     merchant_analysis: Optional[MerchantAnalysisOutput] = None
-    
-    class Config:
-        populate_by_name = True
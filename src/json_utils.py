@@ -0,0 +1,68 @@
+"""
+JSON helpers - orjson when installed, stdlib json otherwise.
+Files are read and written as UTF-8 bytes to skip decode/encode round-trips.
+"""
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Union
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# mkstemp creates files 0600; published files get the usual umask-based mode.
+# Read once at import, since os.umask can only be queried by setting it.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+_FILE_MODE = 0o666 & ~_UMASK
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse a JSON document from bytes or str."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = True) -> bytes:
+    """Serialize to UTF-8 JSON bytes, 2-space indented by default."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
+
+def read_json(path: Union[str, Path]) -> Any:
+    """Load a JSON file."""
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+def write_bytes(path: Union[str, Path], data: bytes) -> None:
+    """
+    Replace path with data atomically: readers see the old file or the new
+    one, never a partial write. The rename also gives path a fresh inode,
+    which keeps hardlinked snapshots of the previous version intact.
+    """
+    # A unique temp file per call, so unlocked writers to the same path
+    # never share (and truncate or steal) each other's temp file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_path, _FILE_MODE)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def write_json(path: Union[str, Path], obj: Any, indent: bool = True) -> None:
+    """Write obj to a JSON file."""
+    write_bytes(path, dumps(obj, indent=indent))
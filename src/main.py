@@ -1,28 +1,58 @@
 import asyncio
 import argparse
-import json
+import atexit
+import itertools
 import logging
-from pathlib import Path
-from datetime import datetime
-from typing import List
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import TYPE_CHECKING, Iterator, List, TextIO
 
-from .scraper_engine import AmazonScraperEngine
-from .parser import AmazonParser
 from .data_importer import DataImporter
 from .models import MasterProduct
 from .enhanced_models import EnhancedMasterProduct, MerchantAnalysisOutput
-from .merchant_engine import AutonomousMerchantEngine
-from .dashboard import MerchantDashboard
-from .cross_marketplace import CrossMarketplaceEngine
+from .cross_marketplace import CrossMarketplaceEngine, MARKETPLACE_FLAGS
 from .config_manager import config
+from .rate_limiter import RateLimiters
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+try:
+    import uvloop
+    HAS_UVLOOP = True
+except ImportError:
+    HAS_UVLOOP = False
+
+# Playwright, the merchant engine and the rich dashboard are imported where
+# they are used, so --stats, --list-db and --import-raw start without them
+if TYPE_CHECKING:
+    from .scraper_engine import AmazonScraperEngine
+    from .parser import AmazonParser
+    from .merchant_engine import AutonomousMerchantEngine
+
+# Records are queued by the caller and written to stderr by a listener
+# thread, so a burst of scrape errors never blocks the event loop on I/O
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+_log_queue = queue.SimpleQueue()
+_log_listener = QueueListener(_log_queue, _log_handler)
+# basicConfig would give the queue handler its default format, and the
+# listener would then format that text a second time
+_queue_handler = QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
 
 
+def _read_asins(f: TextIO) -> Iterator[str]:
+    """Yield ASINs from an open file one line at a time, closing it when done."""
+    with f:
+        for line in f:
+            asin = line.strip()
+            if asin:
+                yield asin
+
+
 async def import_raw_data(marketplace: str = None):
     """Import all data from dumb_datas/ to product_datas/{marketplace}/."""
     logger.info("Starting raw data import...")
@@ -38,8 +68,15 @@ async def import_raw_data(marketplace: str = None):
 
 async def analyze_from_db(asins: List[str], importer: DataImporter):
     """Analyze products from database, save reports to output/."""
+    from .merchant_engine import AutonomousMerchantEngine
+    from .dashboard import MerchantDashboard
+    
     engine = AutonomousMerchantEngine()
     dashboard = MerchantDashboard()
+    products = []
+    base_products = []
+    analyzed = []
+    reports = []
     
     for asin in asins:
         product = importer.get_product(asin)
@@ -47,48 +84,41 @@ async def analyze_from_db(asins: List[str], importer: DataImporter):
             logger.warning(f"Product {asin} not found in {importer.marketplace}/ database")
             continue
         
-        # Convert to dict first to avoid Pydantic type mismatch
-        product_dict = product.model_dump(mode='json')
-        base_product = MasterProduct(
-            identification=product_dict['identification'],
-            sales_analytics=product_dict.get('sales_analytics'),
-            pricing_mechanics=product_dict.get('pricing_mechanics'),
-            competition_and_inventory=product_dict.get('competition_and_inventory'),
-            sentiment_and_quality=product_dict.get('sentiment_and_quality'),
-            logistics_and_physical=product_dict.get('logistics_and_physical'),
-            content_assets=product_dict.get('content_assets'),
-            risk_assessment=product_dict.get('risk_assessment'),
-            data_quality_score=product.meta.data_quality_score if product.meta else 0.5,
-        )
-        
-        report = await engine.analyze(base_product)
+        base_product = MasterProduct.from_enhanced(product)
+        products.append(product)
+        base_products.append(base_product)
+    
+    for product, report in zip(products, await engine.analyze_batch(base_products)):
+        asin = product.identification.asin
         dashboard.display(report)
         
-        product.merchant_analysis = MerchantAnalysisOutput(
-            arbitrage_analysis=report.arbitrage_analysis.model_dump(mode='json'),
-            private_label_analysis=report.private_label_analysis.model_dump(mode='json'),
-            risk_analysis=report.risk_analysis.model_dump(mode='json'),
-            verdict=report.verdict.model_dump(mode='json'),
-            analyzed_at=report.analysis_timestamp
-        )
-        await importer.save_product(product)
+        product.merchant_analysis = MerchantAnalysisOutput.from_report(report)
+        analyzed.append(product)
         
-        mp = importer.marketplace
-        report_filename = f"{mp}_{asin}_{datetime.utcnow().strftime('%Y-%m-%d')}_analysis.json"
-        await importer.save_report(report.model_dump(mode='json'), report_filename)
-        logger.info(f"Report saved: output/reports/{report_filename}")
+        # save_report encodes the model itself in pydantic-core
+        reports.append((report, importer.report_filename(asin)))
+    
+    # analyze() never awaits, so running it under gather would only
+    # interleave the dashboard output; the writes are what overlap. The
+    # updated products go back in one batch alongside the report files.
+    if analyzed:
+        await asyncio.gather(
+            importer.save_products(analyzed),
+            *[importer.save_report(data, filename) for data, filename in reports]
+        )
 
 
 def cross_arbitrage(asins: List[str]):
     """Find cross-marketplace arbitrage opportunities."""
     engine = CrossMarketplaceEngine()
+    opportunities = engine.find_arbitrage_batch(asins)
     
     for asin in asins:
         # Show all prices
         engine.display_all_prices(asin)
         
         # Find best arbitrage
-        opp = engine.find_arbitrage(asin)
+        opp = opportunities[asin]
         if opp:
             engine.display_arbitrage(opp)
         else:
@@ -96,11 +126,34 @@ def cross_arbitrage(asins: List[str]):
             print("(Need data from at least 2 marketplaces)")
 
 
-async def scrape_multi_marketplace(asin: str, marketplaces: List[str], with_analysis: bool = False):
-    """Scrape same ASIN across multiple marketplaces."""
+async def scrape_multi_marketplace(
+    asin: str,
+    marketplaces: List[str],
+    with_analysis: bool = False,
+    engine: "AmazonScraperEngine" = None,
+    limiters: RateLimiters = None
+):
+    """
+    Scrape same ASIN across multiple marketplaces.
+    
+    Pass a live engine to reuse one browser across calls; otherwise one is
+    started for this ASIN and shared by all of its marketplaces. Likewise
+    pass the run's limiters so spacing holds across calls.
+    """
+    from .scraper_engine import AmazonScraperEngine
+    from .parser import AmazonParser
+    from .merchant_engine import AutonomousMerchantEngine
+    
+    if engine is None:
+        async with AmazonScraperEngine(pool_size=len(marketplaces)) as engine:
+            return await scrape_multi_marketplace(asin, marketplaces, with_analysis, engine, limiters)
+    
+    if limiters is None:
+        limiters = RateLimiters()
     parser = AmazonParser()
+    merchant_engine = AutonomousMerchantEngine() if with_analysis else None
     
-    for mp in marketplaces:
+    async def _scrape_marketplace(mp: str):
         logger.info(f"Scraping {asin} from {mp}...")
         
         # Get marketplace config
@@ -109,61 +162,72 @@ async def scrape_multi_marketplace(asin: str, marketplaces: List[str], with_anal
         
         importer = DataImporter(marketplace=mp)
         
-        async with AmazonScraperEngine() as engine:
-            # Override base URL for this marketplace
-            engine.base_url = base_url
-            
-            html = await engine.fetch_page(asin)
-            if not html:
-                logger.warning(f"Failed to fetch {asin} from {mp}")
-                continue
-            
-            product = parser.parse(html, asin)
-            if not product:
-                logger.warning(f"Failed to parse {asin} from {mp}")
-                continue
-            
-            # Create enhanced product with marketplace info
-            product_dict = product.model_dump(mode='json')
-            product_dict['meta'] = {
-                'schema_version': '2.0.0',
-                'scraped_at': datetime.utcnow().isoformat(),
-                'source': f'amazon_{mp}',
-                'marketplace_code': mp,
-                'currency': mp_config.get('currency', 'USD'),
-                'marketplace_url': base_url.replace('/dp/', ''),
-                'data_quality_score': product.data_quality_score or 0.5
-            }
-            
-            enhanced = EnhancedMasterProduct(**product_dict)
-            
-            if with_analysis:
-                merchant_engine = AutonomousMerchantEngine()
-                base_product = MasterProduct(**product.model_dump(mode='json'))
-                report = await merchant_engine.analyze(base_product)
-                
-                enhanced.merchant_analysis = MerchantAnalysisOutput(
-                    arbitrage_analysis=report.arbitrage_analysis.model_dump(mode='json'),
-                    private_label_analysis=report.private_label_analysis.model_dump(mode='json'),
-                    risk_analysis=report.risk_analysis.model_dump(mode='json'),
-                    verdict=report.verdict.model_dump(mode='json'),
-                    analyzed_at=report.analysis_timestamp
-                )
+        # The engine is shared, so the marketplace URL goes with the request;
+        # each host has its own bucket, so marketplaces never wait on each other
+        async with limiters.get(mp):
+            html = await engine.fetch_page(asin, base_url=base_url)
+        if not html:
+            logger.warning(f"Failed to fetch {asin} from {mp}")
+            return
+        
+        product = parser.parse(html, asin)
+        if not product:
+            logger.warning(f"Failed to parse {asin} from {mp}")
+            return
+        
+        # Create enhanced product with marketplace info; a python-mode dump
+        # hands datetimes and nested values over without string conversion
+        product_dict = product.model_dump()
+        product_dict['meta'] = {
+            'schema_version': '2.0.0',
+            # The parser stamps the scrape time; reuse it rather than
+            # reading the clock again
+            'scraped_at': product.scraped_at,
+            'source': f'amazon_{mp}',
+            'marketplace_code': mp,
+            'currency': mp_config.get('currency', 'USD'),
+            'marketplace_url': base_url.replace('/dp/', ''),
+            'data_quality_score': product.data_quality_score or 0.5
+        }
+        
+        enhanced = EnhancedMasterProduct.model_validate(product_dict)
+        
+        if with_analysis:
+            report = await merchant_engine.analyze(product)
             
-            await importer.save_product(enhanced, marketplace=mp)
-            logger.info(f"Saved {asin} to {mp}/ database")
+            enhanced.merchant_analysis = MerchantAnalysisOutput.from_report(report)
+        
+        await importer.save_product(enhanced, marketplace=mp)
+    
+    # Marketplaces are independent, so their fetches overlap
+    results = await asyncio.gather(
+        *[_scrape_marketplace(mp) for mp in marketplaces], return_exceptions=True
+    )
+    for mp, result in zip(marketplaces, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error scraping {asin} from {mp}: {result}")
 
 
 async def process_asin(
     asin: str, 
-    engine: AmazonScraperEngine, 
-    parser: AmazonParser, 
+    engine: "AmazonScraperEngine", 
+    parser: "AmazonParser", 
     importer: DataImporter,
-    run_analysis: bool = False
+    run_analysis: bool = False,
+    merchant_engine: "AutonomousMerchantEngine" = None,
+    limiters: RateLimiters = None
 ):
-    """Scrape and save to marketplace-specific database."""
+    """
+    Scrape and save to marketplace-specific database.
+    
+    Batch callers pass one shared merchant_engine and the run's limiters
+    rather than having new ones built for every ASIN.
+    """
+    if limiters is None:
+        limiters = RateLimiters()
     try:
-        html = await engine.fetch_page(asin)
+        async with limiters.get(importer.marketplace):
+            html = await engine.fetch_page(asin)
         if not html:
             logger.warning(f"Skipping {asin}: No HTML fetched")
             return
@@ -176,40 +240,36 @@ async def process_asin(
         mp = importer.marketplace
         mp_config = config.get_marketplace_config(f"amazon_{mp}")
         
-        product_dict = product.model_dump(mode='json')
+        product_dict = product.model_dump()
         product_dict['meta'] = {
             'schema_version': '2.0.0',
-            'scraped_at': datetime.utcnow().isoformat(),
+            # The parser's own (UTC-aware) timestamp, a datetime rather than
+            # its isoformat(): validation takes it as is instead of parsing
+            'scraped_at': product.scraped_at,
             'source': f'amazon_{mp}',
             'marketplace_code': mp,
             'currency': mp_config.get('currency', 'USD'),
             'data_quality_score': product.data_quality_score or 0.5
         }
-        enhanced = EnhancedMasterProduct(**product_dict)
+        enhanced = EnhancedMasterProduct.model_validate(product_dict)
         
         if run_analysis:
-            merchant_engine = AutonomousMerchantEngine()
-            base_product = MasterProduct(**product.model_dump(mode='json'))
-            report = await merchant_engine.analyze(base_product)
+            if merchant_engine is None:
+                from .merchant_engine import AutonomousMerchantEngine
+                merchant_engine = AutonomousMerchantEngine()
+            # The parser already returns a validated MasterProduct
+            report = await merchant_engine.analyze(product)
             
-            enhanced.merchant_analysis = MerchantAnalysisOutput(
-                arbitrage_analysis=report.arbitrage_analysis.model_dump(mode='json'),
-                private_label_analysis=report.private_label_analysis.model_dump(mode='json'),
-                risk_analysis=report.risk_analysis.model_dump(mode='json'),
-                verdict=report.verdict.model_dump(mode='json'),
-                analyzed_at=report.analysis_timestamp
-            )
+            enhanced.merchant_analysis = MerchantAnalysisOutput.from_report(report)
             
-            report_filename = f"{mp}_{asin}_{datetime.utcnow().strftime('%Y-%m-%d')}_analysis.json"
-            await importer.save_report(report.model_dump(mode='json'), report_filename)
+            report_filename = importer.report_filename(asin)
+            await importer.save_report(report, report_filename)
         
+        # save_product and save_report log their own writes
         await importer.save_product(enhanced)
-        logger.info(f"Saved to database: {mp}/{asin}")
         
     except Exception as e:
-        logger.error(f"Error processing {asin}: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"Error processing {asin}: {e}")
 
 
 async def main():
@@ -231,6 +291,11 @@ Examples:
     parser.add_argument('asins', nargs='*', help="ASINs to scrape")
     parser.add_argument('--file', help="File containing ASINs (one per line)")
     parser.add_argument('--no-headless', action='store_true', help="Show browser window")
+    parser.add_argument('--concurrency', '-c', type=int, default=None,
+                        help="ASINs fetched in parallel (default: scraper.max_concurrency)")
+    parser.add_argument('--rate', type=float, default=None,
+                        help="Requests per second per marketplace "
+                             "(default: 1 / scraper.delay_between_requests_sec)")
     
     # Marketplace options
     parser.add_argument('--marketplace', '-m', default=None, 
@@ -262,17 +327,16 @@ Examples:
     
     # List products
     if args.list_db:
+        # One write per marketplace rather than one print per ASIN
         if marketplace:
             products = importer.list_all_products(marketplace)
             print(f"\n📦 Products in {marketplace.upper()} ({len(products)}):")
-            for asin in products:
-                print(f"  • {asin}")
+            sys.stdout.write(''.join([f"  • {asin}\n" for asin in products]))
         else:
             for mp in importer.list_all_marketplaces():
                 products = importer.list_all_products(mp)
                 print(f"\n📦 {mp.upper()} ({len(products)} products):")
-                for asin in products:
-                    print(f"  • {asin}")
+                sys.stdout.write(''.join([f"  • {asin}\n" for asin in products]))
         return
     
     # Show stats
@@ -285,8 +349,7 @@ Examples:
         print(f"  DB Path:         {stats['db_path']}")
         print(f"\n  By Marketplace:")
         for mp, mp_stats in stats.get('marketplaces', {}).items():
-            flag = {'us': '🇺🇸', 'uk': '🇬🇧', 'de': '🇩🇪', 'jp': '🇯🇵', 'fr': '🇫🇷', 
-                    'es': '🇪🇸', 'it': '🇮🇹', 'ca': '🇨🇦'}.get(mp, '🌐')
+            flag = MARKETPLACE_FLAGS.get(mp, '🌐')
             print(f"    {flag} {mp.upper()}: {mp_stats['products']} products, {mp_stats['size_mb']} MB")
         return
     
@@ -300,26 +363,39 @@ Examples:
         await analyze_from_db(args.analyze_db, importer)
         return
     
-    # Build ASIN list
-    asin_list = args.asins or []
+    # ASINs from --file are streamed rather than read into a list up front,
+    # so large files start scraping immediately and stay out of memory
+    asins = iter(args.asins or [])
     if args.file:
         try:
-            with open(args.file, 'r') as f:
-                file_asins = [line.strip() for line in f if line.strip()]
-                asin_list.extend(file_asins)
+            asins = itertools.chain(asins, _read_asins(open(args.file, 'r')))
         except Exception as e:
             logger.error(f"Error reading ASIN file: {e}")
             return
 
-    if not asin_list:
+    first_asin = next(asins, None)
+    if first_asin is None:
         parser.print_help()
         return
+    asins = itertools.chain([first_asin], asins)
 
+    # Per-marketplace spacing for this run, made inside its event loop
+    limiters = RateLimiters(args.rate)
+    
     # Multi-marketplace scraping
     if args.multi:
+        asin_list = list(asins)
         marketplaces = [m.strip() for m in args.multi.split(',')]
-        for asin in asin_list:
-            await scrape_multi_marketplace(asin, marketplaces, args.with_analysis)
+        
+        # One browser for the whole run, with a pooled context per marketplace
+        from .scraper_engine import AmazonScraperEngine
+        async with AmazonScraperEngine(
+            headless=not args.no_headless, pool_size=len(marketplaces)
+        ) as engine:
+            for asin in asin_list:
+                await scrape_multi_marketplace(
+                    asin, marketplaces, args.with_analysis, engine, limiters
+                )
         
         # Show arbitrage after scraping
         print("\n" + "="*60)
@@ -329,21 +405,50 @@ Examples:
         return
 
     # Single marketplace scraping
-    logger.info(f"Starting scraper for {len(asin_list)} ASINs to {importer.marketplace}/...")
+    from .scraper_engine import AmazonScraperEngine
+    from .parser import AmazonParser
+    from .merchant_engine import AutonomousMerchantEngine
+    
+    concurrency = max(1, args.concurrency or config.max_concurrency)
+    logger.info(f"Starting scraper to {importer.marketplace}/ with {concurrency} workers...")
     amazon_parser = AmazonParser()
+    merchant_engine = AutonomousMerchantEngine() if args.with_analysis else None
+    
+    # One pooled browser context per concurrent fetch
+    async with AmazonScraperEngine(headless=not args.no_headless, pool_size=concurrency) as engine:
+        # A fixed set of workers drains the shared iterator, so only
+        # `concurrency` tasks exist however many ASINs are queued
+        async def _worker():
+            for asin in asins:
+                # Spacing comes from the marketplace's rate limiter, so
+                # workers only wait when the host's budget is spent
+                await process_asin(
+                    asin, engine, amazon_parser, importer, args.with_analysis,
+                    merchant_engine, limiters
+                )
+        
+        results = await asyncio.gather(
+            *[_worker() for _ in range(concurrency)], return_exceptions=True
+        )
     
-    async with AmazonScraperEngine(headless=not args.no_headless) as engine:
-        for asin in asin_list:
-            await process_asin(asin, engine, amazon_parser, importer, args.with_analysis)
-            await asyncio.sleep(2)
+    # process_asin handles per-ASIN failures, so anything here is fatal to a
+    # worker, e.g. a bad line in --file, which also ends the shared iterator
+    for result in results:
+        if isinstance(result, Exception):
+            logger.error(f"Scraper worker stopped early, remaining ASINs skipped: {result!r}")
     
-    stats = importer.get_stats()
-    logger.info(f"Database: {stats['total_products']} products in {stats['db_path']}")
+    # Only the product count is logged, so skip get_stats' full snapshot walk
+    logger.info(f"Database: {importer.count_products()} products in {importer.db_dir.absolute()}")
     logger.info("Scraping completed.")
 
 
 def run():
-    asyncio.run(main())
+    # uvloop (not available on Windows) runs the many concurrent fetches and
+    # writes with less per-await overhead than the default event loop
+    if HAS_UVLOOP:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
 
 
 if __name__ == "__main__":
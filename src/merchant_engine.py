@@ -4,9 +4,12 @@ Calculates profitability, assesses risks, and determines optimal business models
 No external API dependencies - pure mathematical and heuristic logic.
 """
 from __future__ import annotations
-from datetime import datetime
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from datetime import datetime, timezone
 from typing import Optional, List, Dict, Any
 import logging
+import re
 
 from .models import MasterProduct
 from .analysis_models import (
@@ -23,6 +26,97 @@ from .analysis_models import (
 
 logger = logging.getLogger(__name__)
 
+# Private Label score ladders: bisect the value into its band, then index
+# the band's score. bisect_right puts a value equal to a threshold in the
+# band above (">=" / "<" ladders); bisect_left keeps it below ("<=").
+_PL_VELOCITY_THRESHOLDS = (200, 500, 1000)       # monthly sales, >=
+_PL_VELOCITY_SCORES = (20, 50, 80, 100)
+_PL_RATING_THRESHOLDS = (3.5, 4.0, 4.5)          # overall rating, <
+_PL_RATING_SCORES = (100, 80, 50, 20)
+_PL_COMPETITION_THRESHOLDS = (2, 5, 10)          # FBA sellers, <=
+_PL_COMPETITION_SCORES = (100, 70, 40, 10)
+_PL_MOMENTUM_THRESHOLDS = (20, 50, 100)          # reviews per month, >=
+_PL_MOMENTUM_SCORES = (15, 40, 70, 100)
+
+# Negative-review keyword fragment -> suggested fix. Order matters: the
+# first fragment contained in a keyword wins.
+_IMPROVEMENT_MAP = {
+    "plastic": "Use premium materials (metal, glass, BPA-free)",
+    "taste": "Food-grade certification, better materials",
+    "small": "Offer larger capacity variant",
+    "capacity": "Increase size or offer size options",
+    "break": "Reinforce durability, add protective features",
+    "fragile": "Use shatter-resistant materials",
+    "instructions": "Include comprehensive manual/video guide",
+    "leak": "Improve sealing mechanism",
+    "cheap": "Upgrade materials and finish quality",
+    "flimsy": "Strengthen construction, use better materials",
+}
+# One pass over a keyword tells whether any fragment occurs at all; only
+# keywords that match walk the map for the highest-priority fragment
+_IMPROVEMENT_RE = re.compile("|".join(map(re.escape, _IMPROVEMENT_MAP)))
+
+
+# Every scalar the analysis stages read, pulled out of the product once
+_Figures = namedtuple("_Figures", [
+    "buy_box", "list_price", "amazon_fees", "price_stability",
+    "amazon_is_seller", "fba_count", "total_offers",
+    "bsr_change", "bsr_current", "monthly_sales",
+    "rating", "review_velocity",
+    "ip_risk", "return_rate", "seasonal",
+])
+
+
+def _value(section, name: str, default):
+    """section.name, or default when the section is missing or the value is falsy."""
+    if section is None:
+        return default
+    return getattr(section, name) or default
+
+
+def _extract_figures(product: MasterProduct) -> _Figures:
+    pricing = product.pricing_mechanics
+    competition = product.competition_and_inventory
+    sales = product.sales_analytics
+    sentiment = product.sentiment_and_quality
+    risk = product.risk_assessment
+    return _Figures(
+        buy_box=_value(pricing, "buy_box_price", 0.0),
+        list_price=_value(pricing, "list_price", 0.0),
+        amazon_fees=_value(pricing, "amazon_referral_fee_est", 0.0),
+        price_stability=_value(pricing, "price_stability_score", 1.0),
+        amazon_is_seller=_value(competition, "amazon_is_seller", False),
+        fba_count=_value(competition, "fba_seller_count", 0),
+        total_offers=_value(competition, "total_offer_count", 0),
+        bsr_change=_value(sales, "bsr_change_percentage", 0.0),
+        bsr_current=_value(sales, "bsr_current", 999999),
+        monthly_sales=_value(sales, "estimated_monthly_sales", 0),
+        rating=_value(sentiment, "rating_overall", 5.0),
+        review_velocity=_value(sentiment, "review_velocity_monthly", 0),
+        ip_risk=_value(risk, "ip_infringement_risk", "low").lower(),
+        return_rate=_value(risk, "return_rate_estimated", 0.0),
+        seasonal=_value(risk, "seasonal_factor", "non-seasonal"),
+    )
+
+
+def _arbitrage_economics(
+    buy_box: float,
+    amazon_fees: float,
+    fba_costs: float,
+    overhead_pct: float,
+) -> tuple[float, float, float, float]:
+    """
+    Pure arithmetic core of the arbitrage model.
+    
+    Returns (overhead, net_profit, roi_percentage, margin_percentage).
+    """
+    overhead = buy_box * overhead_pct
+    net_profit = buy_box - amazon_fees - fba_costs - overhead
+    total_investment = amazon_fees + fba_costs + overhead
+    roi = (net_profit / total_investment * 100) if total_investment > 0 else 0.0
+    margin = (net_profit / buy_box * 100) if buy_box > 0 else 0.0
+    return overhead, net_profit, roi, margin
+
 
 class AutonomousMerchantEngine:
     """
@@ -62,11 +156,26 @@ class AutonomousMerchantEngine:
         Returns:
             Complete MerchantAnalysisReport with all analysis results
         """
-        logger.info(f"Analyzing product: {product.identification.asin}")
+        return self.analyze_sync(product)
+
+    async def analyze_batch(self, products: List[MasterProduct]) -> List[MerchantAnalysisReport]:
+        """
+        Analyze several products in one call.
         
-        arbitrage = self._analyze_arbitrage(product)
-        pl_analysis = self._analyze_private_label(product)
-        risk = self._analyze_risks(product)
+        Reports come back in input order and share one analysis timestamp;
+        the per-call logging and clock read are paid once for the batch.
+        """
+        logger.info(f"Analyzing batch of {len(products)} products")
+        timestamp = datetime.now(timezone.utc).isoformat()
+        build = self._build_report
+        return [build(product, timestamp) for product in products]
+
+    def _build_report(self, product: MasterProduct, timestamp: str) -> MerchantAnalysisReport:
+        """Run every analysis stage for one product."""
+        figures = _extract_figures(product)
+        arbitrage = self._analyze_arbitrage(product, figures)
+        pl_analysis = self._analyze_private_label(product, figures)
+        risk = self._analyze_risks(figures)
         verdict = self._generate_verdict(arbitrage, pl_analysis, risk, product)
         
         return MerchantAnalysisReport(
@@ -79,45 +188,34 @@ class AutonomousMerchantEngine:
             risk_analysis=risk,
             verdict=verdict,
             data_quality_score=product.data_quality_score or 0.0,
-            analysis_timestamp=datetime.utcnow().isoformat(),
+            analysis_timestamp=timestamp,
             engine_version=self.engine_version,
         )
 
-    def _analyze_arbitrage(self, product: MasterProduct) -> ArbitrageAnalysis:
+    def _analyze_arbitrage(self, product: MasterProduct, figures: _Figures) -> ArbitrageAnalysis:
         """Analyze arbitrage and dropshipping profitability."""
-        pricing = product.pricing_mechanics
-        competition = product.competition_and_inventory
-        sales = product.sales_analytics
-        logistics = product.logistics_and_physical
-        
-        # Safe extraction with None handling
-        buy_box = (pricing.buy_box_price if pricing and pricing.buy_box_price else 0.0) or 0.0
-        amazon_fees = (pricing.amazon_referral_fee_est if pricing and pricing.amazon_referral_fee_est else 0.0) or 0.0
+        buy_box = figures.buy_box
+        amazon_fees = figures.amazon_fees
         
-        fba_costs = self._calculate_fba_costs(logistics)
-        overhead = buy_box * self.OVERHEAD_PERCENTAGE
-        
-        net_profit = buy_box - amazon_fees - fba_costs - overhead
-        
-        total_investment = amazon_fees + fba_costs + overhead
-        roi = (net_profit / total_investment * 100) if total_investment > 0 else 0.0
-        margin = (net_profit / buy_box * 100) if buy_box > 0 else 0.0
+        fba_costs = self._calculate_fba_costs(product.logistics_and_physical)
+        overhead, net_profit, roi, margin = _arbitrage_economics(
+            buy_box, amazon_fees, fba_costs, self.OVERHEAD_PERCENTAGE
+        )
         
-        # Safe extraction with None handling for competition
-        amazon_is_seller = (competition.amazon_is_seller if competition and competition.amazon_is_seller is not None else False)
-        fba_count = (competition.fba_seller_count if competition and competition.fba_seller_count is not None else 0) or 0
-        total_offers = (competition.total_offer_count if competition and competition.total_offer_count is not None else 0) or 0
+        amazon_is_seller = figures.amazon_is_seller
+        fba_count = figures.fba_count
+        total_offers = figures.total_offers
         
         buybox_risk = self._assess_buybox_risk(amazon_is_seller, fba_count, total_offers)
         
-        # Safe extraction for sales
-        bsr_change = (sales.bsr_change_percentage if sales and sales.bsr_change_percentage is not None else 0.0) or 0.0
-        monthly_sales = (sales.estimated_monthly_sales if sales and sales.estimated_monthly_sales is not None else 0) or 0
+        bsr_change = figures.bsr_change
+        monthly_sales = figures.monthly_sales
         velocity = self._assess_velocity(bsr_change, monthly_sales)
         
+        # Days to sell through 100 units; 30 / (sales / 100) is 3000 // sales
         capital_turnover = None
-        if monthly_sales and monthly_sales > 0:
-            capital_turnover = int(30 / (monthly_sales / 100)) if monthly_sales >= 100 else 90
+        if monthly_sales > 0:
+            capital_turnover = 3000 // monthly_sales if monthly_sales >= 100 else 90
         
         return ArbitrageAnalysis(
             buy_box_price=buy_box,
@@ -175,16 +273,10 @@ class AutonomousMerchantEngine:
             return VelocityGrade.STEADY
         return VelocityGrade.SLOW
 
-    def _analyze_private_label(self, product: MasterProduct) -> PrivateLabelAnalysis:
+    def _analyze_private_label(self, product: MasterProduct, figures: _Figures) -> PrivateLabelAnalysis:
         """Analyze Private Label opportunity."""
-        sentiment = product.sentiment_and_quality
-        sales = product.sales_analytics
-        competition = product.competition_and_inventory
-        pricing = product.pricing_mechanics
-        
-        # Safe extraction with None handling
-        list_price = (pricing.list_price if pricing and pricing.list_price else 0.0) or 0.0
-        buy_box = (pricing.buy_box_price if pricing and pricing.buy_box_price else 0.0) or 0.0
+        list_price = figures.list_price
+        buy_box = figures.buy_box
         
         # Use buy_box if list_price is 0
         if list_price == 0:
@@ -194,17 +286,17 @@ class AutonomousMerchantEngine:
         projected_profit = buy_box - target_cogs - (buy_box * self.OVERHEAD_PERCENTAGE)
         projected_margin = (projected_profit / buy_box * 100) if buy_box > 0 else 0.0
         
-        sentiment_gaps = self._extract_sentiment_gaps(sentiment)
+        sentiment_gaps = self._extract_sentiment_gaps(product.sentiment_and_quality)
         
-        bsr_current = (sales.bsr_current if sales and sales.bsr_current else 999999) or 999999
-        rating = (sentiment.rating_overall if sentiment and sentiment.rating_overall else 5.0) or 5.0
+        bsr_current = figures.bsr_current
+        rating = figures.rating
         has_opportunity = bsr_current < 5000 and rating < 4.5 and len(sentiment_gaps) > 0
         
-        pl_score, breakdown = self._calculate_pl_score(product)
+        pl_score, breakdown = self._calculate_pl_score(figures)
         
-        fba_count = (competition.fba_seller_count if competition and competition.fba_seller_count else 0) or 0
-        review_velocity = (sentiment.review_velocity_monthly if sentiment and sentiment.review_velocity_monthly else 0) or 0
-        monthly_sales = (sales.estimated_monthly_sales if sales and sales.estimated_monthly_sales else 0) or 0
+        fba_count = figures.fba_count
+        review_velocity = figures.review_velocity
+        monthly_sales = figures.monthly_sales
         
         market_demand = {
             "review_velocity_monthly": review_velocity,
@@ -233,27 +325,15 @@ class AutonomousMerchantEngine:
             return []
         
         gaps = []
-        improvement_map = {
-            "plastic": "Use premium materials (metal, glass, BPA-free)",
-            "taste": "Food-grade certification, better materials",
-            "small": "Offer larger capacity variant",
-            "capacity": "Increase size or offer size options",
-            "break": "Reinforce durability, add protective features",
-            "fragile": "Use shatter-resistant materials",
-            "instructions": "Include comprehensive manual/video guide",
-            "leak": "Improve sealing mechanism",
-            "cheap": "Upgrade materials and finish quality",
-            "flimsy": "Strengthen construction, use better materials",
-        }
-        
         for i, keyword in enumerate(sentiment.top_negative_keywords[:5]):
             keyword_lower = keyword.lower()
             improvement = "Address customer pain point"
             
-            for key, suggestion in improvement_map.items():
-                if key in keyword_lower:
-                    improvement = suggestion
-                    break
+            if _IMPROVEMENT_RE.search(keyword_lower):
+                for key, suggestion in _IMPROVEMENT_MAP.items():
+                    if key in keyword_lower:
+                        improvement = suggestion
+                        break
             
             gaps.append(SentimentGap(
                 keyword=keyword,
@@ -263,57 +343,21 @@ class AutonomousMerchantEngine:
         
         return gaps
 
-    def _calculate_pl_score(self, product: MasterProduct) -> tuple[int, dict]:
+    def _calculate_pl_score(self, figures: _Figures) -> tuple[int, dict]:
         """Calculate Private Label opportunity score (0-100)."""
         weights = self.PL_WEIGHTS
         breakdown = {}
         
-        sales = product.sales_analytics
-        sentiment = product.sentiment_and_quality
-        competition = product.competition_and_inventory
-        
-        monthly_sales = (sales.estimated_monthly_sales if sales and sales.estimated_monthly_sales else 0) or 0
-        if monthly_sales >= 1000:
-            velocity_score = 100
-        elif monthly_sales >= 500:
-            velocity_score = 80
-        elif monthly_sales >= 200:
-            velocity_score = 50
-        else:
-            velocity_score = 20
+        velocity_score = _PL_VELOCITY_SCORES[bisect_right(_PL_VELOCITY_THRESHOLDS, figures.monthly_sales)]
         breakdown["velocity_score"] = velocity_score
         
-        rating = (sentiment.rating_overall if sentiment and sentiment.rating_overall else 5.0) or 5.0
-        if rating < 3.5:
-            rating_gap_score = 100
-        elif rating < 4.0:
-            rating_gap_score = 80
-        elif rating < 4.5:
-            rating_gap_score = 50
-        else:
-            rating_gap_score = 20
+        rating_gap_score = _PL_RATING_SCORES[bisect_right(_PL_RATING_THRESHOLDS, figures.rating)]
         breakdown["rating_gap_score"] = rating_gap_score
         
-        fba_count = (competition.fba_seller_count if competition and competition.fba_seller_count else 0) or 0
-        if fba_count <= 2:
-            competition_score = 100
-        elif fba_count <= 5:
-            competition_score = 70
-        elif fba_count <= 10:
-            competition_score = 40
-        else:
-            competition_score = 10
+        competition_score = _PL_COMPETITION_SCORES[bisect_left(_PL_COMPETITION_THRESHOLDS, figures.fba_count)]
         breakdown["competition_score"] = competition_score
         
-        review_velocity = (sentiment.review_velocity_monthly if sentiment and sentiment.review_velocity_monthly else 0) or 0
-        if review_velocity >= 100:
-            momentum_score = 100
-        elif review_velocity >= 50:
-            momentum_score = 70
-        elif review_velocity >= 20:
-            momentum_score = 40
-        else:
-            momentum_score = 15
+        momentum_score = _PL_MOMENTUM_SCORES[bisect_right(_PL_MOMENTUM_THRESHOLDS, figures.review_velocity)]
         breakdown["momentum_score"] = momentum_score
         
         final_score = int(
@@ -325,22 +369,19 @@ class AutonomousMerchantEngine:
         
         return min(max(final_score, 0), 100), breakdown
 
-    def _analyze_risks(self, product: MasterProduct) -> RiskAnalysis:
+    def _analyze_risks(self, figures: _Figures) -> RiskAnalysis:
         """Analyze risk factors and defensive logic."""
-        risk = product.risk_assessment
-        pricing = product.pricing_mechanics
-        
-        ip_risk_str = risk.ip_infringement_risk.lower() if risk and risk.ip_infringement_risk else "low"
+        ip_risk_str = figures.ip_risk
         ip_level = RiskLevel.HIGH if ip_risk_str == "high" else RiskLevel.MEDIUM if ip_risk_str == "medium" else RiskLevel.LOW
         ip_auto_reject = ip_level == RiskLevel.HIGH
         
-        stability = (pricing.price_stability_score if pricing and pricing.price_stability_score is not None else 1.0) or 1.0
+        stability = figures.price_stability
         price_war = stability < 0.5
         
-        return_rate = (risk.return_rate_estimated if risk and risk.return_rate_estimated is not None else 0.0) or 0.0
+        return_rate = figures.return_rate
         return_risk = RiskLevel.HIGH if return_rate > 0.10 else RiskLevel.MEDIUM if return_rate > 0.05 else RiskLevel.LOW
         
-        seasonal = (risk.seasonal_factor if risk and risk.seasonal_factor else "non-seasonal") or "non-seasonal"
+        seasonal = figures.seasonal
         
         risk_flags = []
         overall_risk = 0.0
@@ -397,6 +438,28 @@ class AutonomousMerchantEngine:
                 summary="❌ REJECTED: High IP/Trademark risk. Do not proceed with any model.",
             )
         
+        arb_reason = self._arbitrage_reason(arbitrage)
+        pl_reason = self._private_label_reason(pl)
+        
+        # Too little profit for arbitrage (net <= $3 rules out GO and
+        # CONDITIONAL) and too weak for Private Label: every model is NO_GO,
+        # so there is nothing for the verdict chain below to weigh
+        if arbitrage.net_profit <= 3.0 and pl.pl_score < 40:
+            summary = "❌ NOT RECOMMENDED: Risk factors outweigh potential"
+            if risk.risk_flags:
+                summary += f" | Flags: {len(risk.risk_flags)}"
+            return BusinessModelVerdict(
+                arbitrage_verdict=Verdict.NO_GO,
+                arbitrage_reason=arb_reason,
+                dropshipping_verdict=Verdict.NO_GO,
+                dropshipping_reason="Consider velocity and margins",
+                private_label_verdict=Verdict.NO_GO,
+                private_label_reason=pl_reason,
+                recommended_model=None,
+                overall_verdict=Verdict.NO_GO,
+                summary=summary,
+            )
+        
         arb_go = (
             arbitrage.net_profit > 5.0 and
             arbitrage.roi_percentage > 20.0 and
@@ -406,14 +469,6 @@ class AutonomousMerchantEngine:
         )
         
         arb_verdict = Verdict.GO if arb_go else Verdict.CONDITIONAL if arbitrage.net_profit > 3.0 else Verdict.NO_GO
-        arb_reasons = []
-        if arbitrage.amazon_is_seller:
-            arb_reasons.append("Amazon is seller (high competition)")
-        if arbitrage.roi_percentage < 20:
-            arb_reasons.append(f"Low ROI ({arbitrage.roi_percentage:.1f}%)")
-        if arbitrage.velocity_grade == VelocityGrade.SLOW:
-            arb_reasons.append("Slow velocity (capital lock)")
-        arb_reason = "; ".join(arb_reasons) if arb_reasons else "Good margins and velocity"
         
         drop_go = arb_go and arbitrage.velocity_grade != VelocityGrade.SLOW
         drop_verdict = Verdict.GO if drop_go else Verdict.CONDITIONAL if arb_verdict != Verdict.NO_GO else Verdict.NO_GO
@@ -427,20 +482,13 @@ class AutonomousMerchantEngine:
         )
         
         pl_verdict = Verdict.GO if pl_go else Verdict.CONDITIONAL if pl.pl_score >= 40 else Verdict.NO_GO
-        pl_reasons = []
-        if pl.pl_score < 60:
-            pl_reasons.append(f"PL Score too low ({pl.pl_score}/100)")
-        if not pl.has_improvement_opportunity:
-            pl_reasons.append("No clear improvement gap")
-        if pl.competition_level == RiskLevel.HIGH:
-            pl_reasons.append("High competition")
-        pl_reason = "; ".join(pl_reasons) if pl_reasons else f"Strong opportunity (Score: {pl.pl_score}/100)"
         
-        go_count = sum([
-            arb_verdict == Verdict.GO,
-            drop_verdict == Verdict.GO,
-            pl_verdict == Verdict.GO,
-        ])
+        # Enum members are singletons; bools add as ints without a list
+        go_count = (
+            (arb_verdict is Verdict.GO) +
+            (drop_verdict is Verdict.GO) +
+            (pl_verdict is Verdict.GO)
+        )
         
         if go_count >= 2:
             overall = Verdict.GO
@@ -475,7 +523,35 @@ class AutonomousMerchantEngine:
             summary=" | ".join(summary_parts),
         )
 
+    @staticmethod
+    def _arbitrage_reason(arbitrage: ArbitrageAnalysis) -> str:
+        reasons = []
+        if arbitrage.amazon_is_seller:
+            reasons.append("Amazon is seller (high competition)")
+        if arbitrage.roi_percentage < 20:
+            reasons.append(f"Low ROI ({arbitrage.roi_percentage:.1f}%)")
+        if arbitrage.velocity_grade == VelocityGrade.SLOW:
+            reasons.append("Slow velocity (capital lock)")
+        return "; ".join(reasons) if reasons else "Good margins and velocity"
+
+    @staticmethod
+    def _private_label_reason(pl: PrivateLabelAnalysis) -> str:
+        reasons = []
+        if pl.pl_score < 60:
+            reasons.append(f"PL Score too low ({pl.pl_score}/100)")
+        if not pl.has_improvement_opportunity:
+            reasons.append("No clear improvement gap")
+        if pl.competition_level == RiskLevel.HIGH:
+            reasons.append("High competition")
+        return "; ".join(reasons) if reasons else f"Strong opportunity (Score: {pl.pl_score}/100)"
+
     def analyze_sync(self, product: MasterProduct) -> MerchantAnalysisReport:
-        """Synchronous wrapper for analyze method."""
-        import asyncio
-        return asyncio.get_event_loop().run_until_complete(self.analyze(product))
+        """
+        Synchronous version of analyze.
+        
+        The analysis is pure computation with nothing to await, so this runs
+        it directly; no event loop is needed, and it is safe to call from
+        inside a running one.
+        """
+        logger.info(f"Analyzing product: {product.identification.asin}")
+        return self._build_report(product, datetime.now(timezone.utc).isoformat())
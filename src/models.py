@@ -1,7 +1,7 @@
 from __future__ import annotations
 from typing import List, Optional, Dict
-from datetime import datetime
-from pydantic import BaseModel, Field, HttpUrl
+from datetime import datetime, timezone
+from pydantic import BaseModel, Field
 
 class Identification(BaseModel):
     asin: str
@@ -93,7 +93,7 @@ class RiskAssessment(BaseModel):
     seasonal_factor: Optional[str] = None
 
 class MasterProduct(BaseModel):
-    scraped_at: datetime = Field(default_factory=datetime.utcnow)
+    scraped_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     data_quality_score: Optional[float] = None
     
     identification: Identification
@@ -104,3 +104,16 @@ class MasterProduct(BaseModel):
     logistics_and_physical: Optional[LogisticsAndPhysical] = None
     content_assets: Optional[ContentAssets] = None
     risk_assessment: Optional[RiskAssessment] = None
+    
+    @classmethod
+    def from_enhanced(cls, enhanced) -> MasterProduct:
+        """
+        Build from an EnhancedMasterProduct.
+        
+        The two schemas use separate section classes, so the sections are
+        re-validated straight from the loaded attributes; model_construct
+        would leave the enhanced section objects in place.
+        """
+        product = cls.model_validate(enhanced, from_attributes=True)
+        product.data_quality_score = enhanced.meta.data_quality_score if enhanced.meta else 0.5
+        return product
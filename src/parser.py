@@ -1,164 +1,220 @@
 import logging
 import re
-from typing import Dict, Any, Optional, List
-from bs4 import BeautifulSoup, Tag
+from datetime import datetime, timezone
+from types import MappingProxyType
+from typing import Dict, Optional
+from lxml import etree, html as lxml_html
 from .models import (
     MasterProduct, Identification, SalesAnalytics, PricingMechanics,
     CompetitionAndInventory, SentimentAndQuality, LogisticsAndPhysical,
-    ContentAssets, RiskAssessment, CompetitorStockLevel, RatingBreakdown, Dimensions
+    ContentAssets, RiskAssessment
 )
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-SELECTOR_MAP = {
-    "identification": {
-        "title": "#productTitle",
-        "brand": "#bylineInfo",
-        "manufacturer": "#detailBullets_feature_div > ul > li:nth-child(3) > span > span:nth-child(2)",
-        "category_path": "#wayfinding-breadcrumbs_feature_div ul li a",
-    },
-    "sales_analytics": {
-        "bsr_info": "#SalesRank",
-    },
-    "pricing_mechanics": {
-        "buy_box_price": ".a-price .a-offscreen", 
-        "list_price": ".a-text-price .a-offscreen",
-    },
-    "competition": {
-        "offer_count": "#olpLinkWidget_feature_div .a-declarative",
-    },
-    "sentiment": {
-        "rating_overall": "#acrPopover .a-icon-alt",
-        "review_count": "#acrCustomerReviewText",
-    },
-    "logistics": {
-        "details_table": "#prodDetails",
-    },
-    "content": {
-        "main_image": "#landingImage",
-        "bullets": "#feature-bullets ul li span.a-list-item",
-        "description": "#productDescription",
-    }
-}
 
-class AmazonParser:
-    """
-    Parses HTML content using BeautifulSoup and a Selector Map 
-    to populate Pydantic models.
-    """
+def _has_class(name: str) -> str:
+    """XPath predicate equivalent to the CSS `.name` class selector."""
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+
+# Selectors are compiled to XPath once at import so no page pays for
+# CSS -> XPath translation.
+SELECTOR_MAP = MappingProxyType({
+    "identification": MappingProxyType({
+        "title": etree.XPath('//*[@id="productTitle"]'),
+        "brand": etree.XPath('//*[@id="bylineInfo"]'),
+        "manufacturer": etree.XPath('//*[@id="detailBullets_feature_div"]/ul/li[3]/span/span[2]'),
+        "category_path": etree.XPath('//*[@id="wayfinding-breadcrumbs_feature_div"]//ul//li//a'),
+    }),
+    "sales_analytics": MappingProxyType({
+        "bsr_info": etree.XPath('//*[@id="SalesRank"]'),
+    }),
+    "pricing_mechanics": MappingProxyType({
+        "buy_box_price": etree.XPath(f'//*[{_has_class("a-price")}]//*[{_has_class("a-offscreen")}]'),
+        "list_price": etree.XPath(f'//*[{_has_class("a-text-price")}]//*[{_has_class("a-offscreen")}]'),
+    }),
+    "competition": MappingProxyType({
+        "offer_count": etree.XPath(f'//*[@id="olpLinkWidget_feature_div"]//*[{_has_class("a-declarative")}]'),
+    }),
+    "sentiment": MappingProxyType({
+        "rating_overall": etree.XPath(f'//*[@id="acrPopover"]//*[{_has_class("a-icon-alt")}]'),
+        "review_count": etree.XPath('//*[@id="acrCustomerReviewText"]'),
+    }),
+    "logistics": MappingProxyType({
+        "details_table": etree.XPath('//*[@id="prodDetails"]'),
+    }),
+    "content": MappingProxyType({
+        "main_image": etree.XPath('//*[@id="landingImage"]'),
+        "bullets": etree.XPath(f'//*[@id="feature-bullets"]//ul//li//span[{_has_class("a-list-item")}]'),
+        "description": etree.XPath('//*[@id="productDescription"]'),
+    })
+})
+
+# Comments and processing instructions are never selected, and the XPaths match
+# @id directly, so skip building those nodes and libxml2's ID table.
+# Pages arrive already decoded and are fed back as UTF-8 bytes: lxml rejects
+# str input carrying an XML encoding declaration, and the fixed encoding
+# keeps a stale <meta charset> from re-decoding the text.
+_HTML_PARSER = lxml_html.HTMLParser(
+    remove_comments=True, remove_pis=True, collect_ids=False, encoding="utf-8"
+)
 
-    def _clean_text(self, text: str) -> str:
-        return text.strip() if text else ""
+# Shared text collector; plain strings avoid the parent back-reference
+# that lxml's default "smart" string results carry.
+_TEXT = etree.XPath("string()", smart_strings=False)
 
-    def _extract_price(self, text: str) -> Optional[float]:
-        if not text:
-            return None
-        match = re.search(r'[\d,]+\.\d{2}', text)
-        if match:
-            return float(match.group().replace(',', ''))
+_PRICE_RE = re.compile(r'[\d,]+\.\d{2}')
+_INT_RE = re.compile(r'[\d,]+')
+_STRIP_COMMAS = {ord(','): None}
+
+# Brands, manufacturers and category names repeat heavily across a run;
+# share one string object per distinct value (bounded so it cannot grow forever).
+_INTERN_MAX = 10_000
+_INTERN: Dict[str, str] = {}
+
+
+def _intern(s: Optional[str]) -> Optional[str]:
+    if not s:
+        return s
+    cached = _INTERN.get(s)
+    if cached is not None:
+        return cached
+    if len(_INTERN) < _INTERN_MAX:
+        _INTERN[s] = s
+    return s
+
+
+def _extract_price(text: str) -> Optional[float]:
+    if not text:
         return None
+    match = _PRICE_RE.search(text)
+    if match:
+        return float(match.group().translate(_STRIP_COMMAS))
+    return None
 
-    def _extract_int(self, text: str) -> Optional[int]:
-        if not text:
-            return None
-        match = re.search(r'[\d,]+', text)
-        if match:
-            return int(match.group().replace(',', ''))
+
+def _extract_int(text: str) -> Optional[int]:
+    if not text:
         return None
+    match = _INT_RE.search(text)
+    if match:
+        return int(match.group().translate(_STRIP_COMMAS))
+    return None
+
+
+def _get_text(tree: lxml_html.HtmlElement, selector: etree.XPath) -> Optional[str]:
+    elements = selector(tree)
+    return _TEXT(elements[0]).strip() if elements else None
+
+
+class AmazonParser:
+    """
+    Parses HTML content using lxml and a precompiled XPath Selector Map
+    to populate Pydantic models.
+    
+    Section models are built with model_construct() since the extractors
+    already produce typed values; MasterProduct stays validated. The parser
+    holds no state, so the extractors are static.
+    """
 
     def parse(self, html: str, asin: str) -> Optional[MasterProduct]:
         if not html:
             logger.error(f"Empty HTML provided for {asin}")
             return None
 
-        soup = BeautifulSoup(html, 'html.parser')
-        
         try:
+            try:
+                tree = lxml_html.fromstring(html.encode("utf-8"), parser=_HTML_PARSER)
+            except etree.ParserError:
+                # Whitespace-only pages have no root; parse them as an empty
+                # document so every field just comes back missing
+                tree = lxml_html.fromstring(b"<html></html>", parser=_HTML_PARSER)
             return MasterProduct(
-                identification=self._extract_identification(soup, asin),
-                sales_analytics=self._extract_sales_analytics(soup),
-                pricing_mechanics=self._extract_pricing(soup),
-                competition_and_inventory=self._extract_competition(soup),
-                sentiment_and_quality=self._extract_sentiment(soup),
-                logistics_and_physical=self._extract_logistics(soup),
-                content_assets=self._extract_content(soup),
-                risk_assessment=self._extract_risk(soup)
+                scraped_at=datetime.now(timezone.utc),
+                identification=self._extract_identification(tree, asin),
+                sales_analytics=self._extract_sales_analytics(tree),
+                pricing_mechanics=self._extract_pricing(tree),
+                competition_and_inventory=self._extract_competition(tree),
+                sentiment_and_quality=self._extract_sentiment(tree),
+                logistics_and_physical=self._extract_logistics(tree),
+                content_assets=self._extract_content(tree),
+                risk_assessment=self._extract_risk(tree)
             )
         except Exception as e:
             logger.error(f"Failed to parse product {asin}: {str(e)}")
             return None
 
-    def _get_text(self, soup: BeautifulSoup, selector: str) -> Optional[str]:
-        element = soup.select_one(selector)
-        return self._clean_text(element.get_text()) if element else None
-
-    def _extract_identification(self, soup: BeautifulSoup, asin: str) -> Identification:
+    @staticmethod
+    def _extract_identification(tree: lxml_html.HtmlElement, asin: str) -> Identification:
         selectors = SELECTOR_MAP["identification"]
-        
-        categories = []
-        cat_elements = soup.select(selectors["category_path"])
-        for cat in cat_elements:
-            categories.append(self._clean_text(cat.get_text()))
 
-        return Identification(
+        categories = [_intern(t) for t in (_TEXT(c).strip() for c in selectors["category_path"](tree)) if t]
+
+        return Identification.model_construct(
             asin=asin,
-            title=self._get_text(soup, selectors["title"]),
-            brand=self._get_text(soup, selectors["brand"]),
-            manufacturer=self._get_text(soup, selectors["manufacturer"]),
+            title=_get_text(tree, selectors["title"]),
+            brand=_intern(_get_text(tree, selectors["brand"])),
+            manufacturer=_intern(_get_text(tree, selectors["manufacturer"])),
             category_path=categories
         )
 
-    def _extract_sales_analytics(self, soup: BeautifulSoup) -> SalesAnalytics:
-        return SalesAnalytics()
+    @staticmethod
+    def _extract_sales_analytics(tree: lxml_html.HtmlElement) -> SalesAnalytics:
+        return SalesAnalytics.model_construct()
 
-    def _extract_pricing(self, soup: BeautifulSoup) -> PricingMechanics:
+    @staticmethod
+    def _extract_pricing(tree: lxml_html.HtmlElement) -> PricingMechanics:
         selectors = SELECTOR_MAP["pricing_mechanics"]
-        
-        buy_box_text = self._get_text(soup, selectors["buy_box_price"])
-        list_price_text = self._get_text(soup, selectors["list_price"])
-        
-        return PricingMechanics(
-            buy_box_price=self._extract_price(buy_box_text),
-            list_price=self._extract_price(list_price_text)
+
+        buy_box_text = _get_text(tree, selectors["buy_box_price"])
+        list_price_text = _get_text(tree, selectors["list_price"])
+
+        return PricingMechanics.model_construct(
+            buy_box_price=_extract_price(buy_box_text),
+            list_price=_extract_price(list_price_text)
         )
 
-    def _extract_competition(self, soup: BeautifulSoup) -> CompetitionAndInventory:
-        return CompetitionAndInventory()
+    @staticmethod
+    def _extract_competition(tree: lxml_html.HtmlElement) -> CompetitionAndInventory:
+        return CompetitionAndInventory.model_construct()
 
-    def _extract_sentiment(self, soup: BeautifulSoup) -> SentimentAndQuality:
+    @staticmethod
+    def _extract_sentiment(tree: lxml_html.HtmlElement) -> SentimentAndQuality:
         selectors = SELECTOR_MAP["sentiment"]
-        
-        rating_text = self._get_text(soup, selectors["rating_overall"])
-        review_count_text = self._get_text(soup, selectors["review_count"])
-        
-        rating = self._extract_price(rating_text)
-        reviews = self._extract_int(review_count_text)
-        
-        return SentimentAndQuality(
+
+        rating_text = _get_text(tree, selectors["rating_overall"])
+        review_count_text = _get_text(tree, selectors["review_count"])
+
+        rating = _extract_price(rating_text)
+        reviews = _extract_int(review_count_text)
+
+        return SentimentAndQuality.model_construct(
             rating_overall=rating,
             review_count=reviews
         )
 
-    def _extract_logistics(self, soup: BeautifulSoup) -> LogisticsAndPhysical:
-        return LogisticsAndPhysical()
+    @staticmethod
+    def _extract_logistics(tree: lxml_html.HtmlElement) -> LogisticsAndPhysical:
+        return LogisticsAndPhysical.model_construct()
 
-    def _extract_content(self, soup: BeautifulSoup) -> ContentAssets:
+    @staticmethod
+    def _extract_content(tree: lxml_html.HtmlElement) -> ContentAssets:
         selectors = SELECTOR_MAP["content"]
-        
-        bullets = []
-        bullet_elements = soup.select(selectors["bullets"])
-        for b in bullet_elements:
-            bullets.append(self._clean_text(b.get_text()))
 
-        main_img_elem = soup.select_one(selectors["main_image"])
-        main_image = main_img_elem.get('src') or main_img_elem.get('data-old-hires') if main_img_elem else None
+        bullets = [t for t in (_TEXT(b).strip() for b in selectors["bullets"](tree)) if t]
+
+        main_img_elems = selectors["main_image"](tree)
+        main_img_elem = main_img_elems[0] if main_img_elems else None
+        main_image = main_img_elem.get('src') or main_img_elem.get('data-old-hires') if main_img_elem is not None else None
 
-        return ContentAssets(
+        return ContentAssets.model_construct(
             main_image_url=main_image,
-            description_text=self._get_text(soup, selectors["description"]),
+            description_text=_get_text(tree, selectors["description"]),
             bullet_points=bullets
         )
 
-    def _extract_risk(self, soup: BeautifulSoup) -> RiskAssessment:
-        return RiskAssessment()
+    @staticmethod
+    def _extract_risk(tree: lxml_html.HtmlElement) -> RiskAssessment:
+        return RiskAssessment.model_construct()
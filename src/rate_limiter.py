@@ -0,0 +1,72 @@
+"""
+Rate Limiter - Per-marketplace token buckets for polite scraping.
+Requests to one Amazon host are spaced out; different hosts never wait on each other.
+"""
+import asyncio
+from typing import Dict, Optional
+
+from .config_manager import config
+
+
+class RateLimiter:
+    """
+    Async token bucket: `rate` requests per second, bursts of up to `burst`.
+    
+    Use as `async with limiter:` around the request. Waiters are served in
+    arrival order; a rate of 0 or less disables limiting.
+    """
+    
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated: Optional[float] = None
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """Wait until a request may be sent."""
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            if self._updated is not None:
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._tokens = 0.0
+                self._updated = loop.time()
+            else:
+                self._tokens -= 1
+    
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class RateLimiters:
+    """
+    One limiter per marketplace, shared by every task hitting that host.
+    
+    Create one per run, inside the event loop that uses it, and pass it
+    down: the limiters' locks belong to that loop. The default rate keeps
+    the configured delay_between_requests_sec spacing.
+    """
+    
+    def __init__(self, rate: float = None):
+        if rate is None:
+            rate = 1 / config.delay if config.delay > 0 else 0
+        self.rate = rate
+        self._limiters: Dict[str, RateLimiter] = {}
+    
+    def get(self, marketplace: str) -> RateLimiter:
+        """Return the limiter for a marketplace, creating it on first use."""
+        limiter = self._limiters.get(marketplace)
+        if limiter is None:
+            limiter = self._limiters[marketplace] = RateLimiter(self.rate)
+        return limiter
@@ -1,8 +1,11 @@
 import asyncio
 import logging
 import random
-from typing import Optional, List
-from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright
+from collections import deque
+from typing import Dict, Optional
+from playwright.async_api import (
+    async_playwright, Browser, BrowserContext, Page, Playwright, Route
+)
 
 try:
     from playwright_stealth import stealth_async
@@ -15,6 +18,35 @@ from .config_manager import config
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+CAPTCHA_MARKER = "Type the characters you see below"
+
+# The parser only reads markup, so anything that is purely rendering is dropped
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "stylesheet", "font", "media"})
+
+# Ad and analytics hosts; their scripts and beacons never carry product data
+BLOCKED_URL_FRAGMENTS = (
+    "googletagmanager", "google-analytics", "doubleclick",
+    "amazon-adsystem", "scribe.amazon", "fls-na.amazon", "unagi.amazon",
+)
+
+
+# When fewer than FAST_PATH_MIN_SUCCESS of a host's last FAST_PATH_WINDOW
+# fast-path attempts returned a usable page, its next FAST_PATH_BACKOFF
+# fetches go straight to the browser instead of paying for a doomed request
+FAST_PATH_WINDOW = 20
+FAST_PATH_MIN_SUCCESS = 0.3
+FAST_PATH_BACKOFF = 50
+
+
+async def _block_heavy_resources(route: Route):
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    elif any(fragment in request.url for fragment in BLOCKED_URL_FRAGMENTS):
+        await route.abort()
+    else:
+        await route.continue_()
+
 
 class AmazonScraperEngine:
     """
@@ -22,7 +54,14 @@ class AmazonScraperEngine:
     and rotating User-Agents. Configuration loaded from config/scraping_config.json.
     """
 
-    def __init__(self, headless: bool = None, timeout: int = None, max_retries: int = None):
+    def __init__(
+        self,
+        headless: bool = None,
+        timeout: int = None,
+        max_retries: int = None,
+        pool_size: int = None,
+        http_fast_path: bool = None
+    ):
         # Use config values as defaults, allow override via constructor
         self.headless = headless if headless is not None else config.headless
         self.timeout = timeout if timeout is not None else config.timeout
@@ -30,19 +69,35 @@ class AmazonScraperEngine:
         self.base_url = config.base_url
         self.user_agents = config.user_agents
         self.delay = config.delay
+        self.pool_size = pool_size if pool_size is not None else config.max_concurrency
+        self.http_fast_path = http_fast_path if http_fast_path is not None else config.http_fast_path
         
         self.playwright: Optional[Playwright] = None
         self.browser: Optional[Browser] = None
-        self.context: Optional[BrowserContext] = None
+        self._context_pool: Optional[asyncio.Queue] = None
+        
+        # base_url -> recent fast-path outcomes / fetches left to skip it for
+        self._fast_path_outcomes: Dict[str, deque] = {}
+        self._fast_path_skip: Dict[str, int] = {}
         
         logger.info(f"ScraperEngine initialized: marketplace={config.marketplace}, base_url={self.base_url}")
         
     async def __aenter__(self):
         self.playwright = await async_playwright().start()
         self.browser = await self.playwright.chromium.launch(headless=self.headless)
+        
+        # Contexts (profile, cookie jar, stealth init scripts) are built once
+        # and handed out per fetch; User-Agents rotate across the pool.
+        self._context_pool = asyncio.Queue()
+        for i in range(max(1, self.pool_size)):
+            user_agent = self.user_agents[i % len(self.user_agents)] if self.user_agents else None
+            self._context_pool.put_nowait(await self._create_context(user_agent))
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self._context_pool:
+            while not self._context_pool.empty():
+                await self._context_pool.get_nowait().close()
         if self.browser:
             await self.browser.close()
         if self.playwright:
@@ -53,8 +108,8 @@ class AmazonScraperEngine:
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
         )
 
-    async def _create_context(self) -> BrowserContext:
-        user_agent = self._get_random_user_agent()
+    async def _create_context(self, user_agent: str = None) -> BrowserContext:
+        user_agent = user_agent or self._get_random_user_agent()
         logger.debug(f"Using User-Agent: {user_agent}")
         
         context = await self.browser.new_context(
@@ -63,32 +118,94 @@ class AmazonScraperEngine:
             java_script_enabled=True,
             accept_downloads=False
         )
+        await context.route("**/*", _block_heavy_resources)
+        
+        if HAS_STEALTH:
+            # stealth_async only registers init scripts, which a context
+            # applies to every page it opens.
+            await stealth_async(context)
         return context
 
-    async def fetch_page(self, asin: str) -> Optional[str]:
+    async def _fetch_http(self, context: BrowserContext, url: str, asin: str) -> Optional[str]:
+        """
+        Fetch the page through the context's request client, which shares its
+        cookies, User-Agent and connection pool but renders nothing. Returns None
+        when the response is unusable (non-200, CAPTCHA) so the caller can
+        escalate to a full page load.
+        """
+        try:
+            response = await context.request.get(url, timeout=self.timeout)
+            if response.status != 200:
+                logger.debug(f"HTTP fast path got {response.status} for {asin}")
+                return None
+            
+            content = await response.text()
+            if CAPTCHA_MARKER in content:
+                logger.debug(f"HTTP fast path hit CAPTCHA for {asin}")
+                return None
+            return content
+        except Exception as e:
+            logger.debug(f"HTTP fast path failed for {asin}: {e}")
+            return None
+
+    def _use_fast_path(self, host: str) -> bool:
+        skip = self._fast_path_skip.get(host, 0)
+        if skip:
+            self._fast_path_skip[host] = skip - 1
+            return False
+        return True
+
+    def _record_fast_path(self, host: str, ok: bool):
+        outcomes = self._fast_path_outcomes.get(host)
+        if outcomes is None:
+            outcomes = self._fast_path_outcomes[host] = deque(maxlen=FAST_PATH_WINDOW)
+        outcomes.append(ok)
+        if len(outcomes) == FAST_PATH_WINDOW and sum(outcomes) < FAST_PATH_MIN_SUCCESS * FAST_PATH_WINDOW:
+            logger.info(f"HTTP fast path failing for {host}; using the browser for the next {FAST_PATH_BACKOFF} fetches")
+            self._fast_path_skip[host] = FAST_PATH_BACKOFF
+            outcomes.clear()
+
+    async def fetch_page(self, asin: str, base_url: str = None) -> Optional[str]:
         """
         Fetches the product page for a given ASIN with retries and rotation.
         Returns the HTML content string or None if failed.
+        
+        base_url overrides the engine's marketplace for this call only, so
+        one engine can serve several marketplaces concurrently.
         """
-        url = f"{self.base_url}{asin}"
+        host = base_url or self.base_url
+        url = f"{host}{asin}"
+        
+        if self.http_fast_path and self._use_fast_path(host):
+            context = await self._context_pool.get()
+            try:
+                content = await self._fetch_http(context, url, asin)
+            finally:
+                self._context_pool.put_nowait(context)
+            self._record_fast_path(host, bool(content))
+            if content:
+                return content
+            logger.info(f"Escalating {asin} to browser fetch")
         
         for attempt in range(self.max_retries):
-            context = None
+            context = await self._context_pool.get()
             page = None
+            recycle = False
             try:
-                context = await self._create_context()
                 page = await context.new_page()
                 
-                if HAS_STEALTH:
-                    await stealth_async(page)
-                
                 logger.info(f"Fetching {asin} (Attempt {attempt + 1}/{self.max_retries})")
                 
-                await page.goto(url, timeout=self.timeout, wait_until="domcontentloaded")
+                response = await page.goto(url, timeout=self.timeout, wait_until="domcontentloaded")
                 
-                content = await page.content()
+                # Product pages are server-rendered, so the raw body is what the
+                # parser needs; serializing the live DOM is only a fallback.
+                if response is not None and response.ok:
+                    content = await response.text()
+                else:
+                    content = await page.content()
                 
-                if "Type the characters you see below" in content:
+                if CAPTCHA_MARKER in content:
                     logger.warning(f"CAPTCHA detected for {asin}")
                     raise Exception("CAPTCHA detected")
                 
@@ -96,16 +213,27 @@ class AmazonScraperEngine:
 
             except Exception as e:
                 logger.warning(f"Error fetching {asin} on attempt {attempt + 1}: {str(e)}")
+                # A flagged session would keep failing; swap in a fresh context
+                recycle = True
                 if attempt == self.max_retries - 1:
                     logger.error(f"Failed to fetch {asin} after {self.max_retries} attempts")
                     return None
-                
-                await asyncio.sleep(2 ** attempt + random.uniform(1, 3))
             
             finally:
-                if page:
-                    await page.close()
-                if context:
-                    await context.close()
+                try:
+                    if page:
+                        await page.close()
+                    if recycle:
+                        await context.close()
+                        context = await self._create_context()
+                except Exception as e:
+                    # A closed context left in the pool fails its next fetch
+                    # and gets recycled again; losing it would hang the pool
+                    logger.warning(f"Failed to recycle browser context: {e}")
+                finally:
+                    self._context_pool.put_nowait(context)
+            
+            # Back off after releasing the context so waiters can use it
+            await asyncio.sleep(2 ** attempt + random.uniform(1, 3))
         
         return None